@@ -1,2 +1,3 @@
 from .pycrucible import *
+from .async_client import AsyncCrucibleClient
 from . import config
@@ -0,0 +1,415 @@
+import os
+import random
+import asyncio
+from functools import partial
+from typing import Optional, List, Dict, Any, Tuple
+
+from .models import BaseDataset
+from .pycrucible import CrucibleClient, httpx, _sample_info, _encode_json, _is_json, _json_loads
+from .utils import get_tz_isoformat
+
+
+class AsyncCrucibleClient:
+    """Asyncio client for the Crucible API.
+
+    Requests are coroutines sharing one HTTP/2 connection pool, so independent
+    calls can be awaited together with asyncio.gather, e.g.
+
+        async with AsyncCrucibleClient(api_url, api_key) as client:
+            samples = await asyncio.gather(*(client.add_sample(**s) for s in sample_list))
+
+    Blocking work (the cached user, project and instrument lookups, hashing and
+    large-file transfers) is delegated to a synchronous CrucibleClient, available
+    as `client.sync`, running in a worker thread.
+    """
+
+    def __init__(self, api_url: str, api_key: str, max_connections: int = 64, **kwargs):
+        """
+        Initialize the async Crucible API client.
+
+        Args:
+            api_url: Base URL for the Crucible API
+            api_key: API key for authentication
+            max_connections: Maximum number of open connections (default: 64)
+            **kwargs: Additional arguments for the wrapped CrucibleClient (cache, cache_dir)
+        """
+        if httpx is None:
+            raise ImportError("httpx needs to be installed for the async API: pip install pycrucible[async]")
+        self.sync = CrucibleClient(api_url, api_key, **kwargs)
+        self.api_url = self.sync.api_url
+        self._client = httpx.AsyncClient(http2=True,
+                                         headers=self.sync.headers,
+                                         limits=httpx.Limits(max_connections=max_connections,
+                                                             max_keepalive_connections=max_connections // 2),
+                                         timeout=10)
+
+    async def aclose(self):
+        """Close the connections held by the client."""
+        await self._client.aclose()
+        self.sync.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Make an HTTP request to the API.
+
+        Args:
+            method: HTTP method (get, post, put, delete)
+            endpoint: API endpoint path
+            **kwargs: Additional arguments to pass to httpx
+
+        Returns:
+            Parsed JSON response, None for an empty body, or the httpx.Response
+            itself when the body is not JSON (as CrucibleClient._request does)
+        """
+        url = self.sync._base + endpoint.lstrip('/')
+        kwargs = _encode_json(kwargs)
+        if isinstance(kwargs.get('data'), bytes):
+            kwargs['content'] = kwargs.pop('data')
+        response = await self._client.request(method, url, **kwargs)
+        response.raise_for_status()
+        content = response.content
+        if not content:
+            return None
+        if not _is_json(response):
+            return response
+        try:
+            return _json_loads(content)
+        except ValueError:
+            # not a JSON body
+            return response
+
+    async def _run_sync(self, func, *args, **kwargs):
+        """Run a blocking call in the default thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+    async def _batch_or_gather(self, feature: str, batch_endpoint: str, batch_json: Dict, single_requests):
+        """Send one request to a batch endpoint, or the single requests concurrently.
+
+        Mirrors the sync client's *_bulk methods: the batch endpoint is only
+        used when the server advertises it.
+
+        Args:
+            feature: Capability gating the batch endpoint (see CrucibleClient._FEATURES)
+            batch_endpoint: API path of the batch endpoint
+            batch_json: Body of the batch request
+            single_requests: Callable returning the coroutines of the fallback requests
+
+        Returns:
+            List: Results of the batch request or of the single requests
+        """
+        if await self._run_sync(self.sync._capability, feature):
+            return await self._request('post', batch_endpoint, json=batch_json)
+        return list(await asyncio.gather(*single_requests()))
+
+    async def get_dataset(self, dsid: str, include_metadata: bool = False) -> Dict:
+        """Get dataset details, optionally including scientific metadata.
+
+        Args:
+            dsid (str): Dataset unique identifier
+            include_metadata (bool): Whether to include scientific metadata
+
+        Returns:
+            Dict: Dataset object with optional metadata
+        """
+        dataset = await self._request('get', f'/datasets/{dsid}')
+        if dataset and include_metadata:
+            try:
+                metadata = await self.get_scientific_metadata(dsid)
+                dataset['scientific_metadata'] = metadata or {}
+            except httpx.HTTPError:
+                dataset['scientific_metadata'] = {}
+        return dataset
+
+    async def get_scientific_metadata(self, dsid: str) -> Dict:
+        """Get scientific metadata for a dataset.
+
+        Args:
+            dsid (str): Dataset ID
+
+        Returns:
+            Dict: Scientific metadata containing experimental parameters and settings
+        """
+        return await self._request('get', f'/datasets/{dsid}/scientific_metadata')
+
+    async def get_datasets_bulk(self, dsids: List[str], include_metadata: bool = False,
+                                max_concurrency: int = 16) -> List[Dict]:
+        """Get several datasets concurrently.
+
+        Args:
+            dsids (List[str]): Dataset unique identifiers
+            include_metadata (bool): Whether to include scientific metadata
+            max_concurrency (int): Maximum number of datasets fetched at once (default: 16)
+
+        Returns:
+            List[Dict]: Dataset objects, in the same order as dsids
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(dsid):
+            async with semaphore:
+                return await self.get_dataset(dsid, include_metadata)
+        return list(await asyncio.gather(*[fetch(dsid) for dsid in dsids]))
+
+    async def add_sample(self, unique_id: str = None, sample_name: str = None, description: str = None,
+                         creation_date: str = None, owner_orcid: str = None, owner_id: int = None, project_id: str = None, sample_type: str = None,
+                         parents: Optional[List[Dict]] = None, children: Optional[List[Dict]] = None) -> Dict:
+        """Add a new sample with optional parent-child relationships.
+
+        The parent and child links are created concurrently once the sample exists.
+        See CrucibleClient.add_sample for the arguments.
+
+        Returns:
+            Dict: Created sample object
+        """
+        if unique_id is None and sample_name is None:
+            raise Exception('Please provide either a unique ID or a sample name for your sample')
+
+        sample_info = _sample_info(unique_id, sample_name, sample_type, owner_orcid, owner_id,
+                                   description, project_id, creation_date)
+        new_samp = await self._request('post', "/samples", json=sample_info)
+
+        sample_id = new_samp['unique_id']
+        links = [(p['unique_id'], sample_id) for p in parents or ()]
+        links += [(sample_id, chd['unique_id']) for chd in children or ()]
+        await asyncio.gather(*[self._request('post', f"/samples/{parent_id}/children/{child_id}")
+                               for parent_id, child_id in links])
+
+        self.sync.invalidate_cache('get_sample')
+        return new_samp
+
+    async def add_dataset_keywords_bulk(self, dsid: str, keywords: List[str]) -> List[Dict]:
+        """Add several keywords to a dataset, in one request when the server supports it.
+
+        See CrucibleClient.add_dataset_keywords_bulk for the arguments.
+
+        Returns:
+            List[Dict]: Keyword objects with updated usage counts
+        """
+        keywords = list(keywords)
+        if not keywords:
+            return []
+        return await self._batch_or_gather(
+            'bulk_keywords', f'/datasets/{dsid}/keywords:batch', {'keywords': keywords},
+            lambda: [self._request('post', f'/datasets/{dsid}/keywords', params={'keyword': kw})
+                     for kw in keywords])
+
+    async def add_associated_files_bulk(self, dsid: str, associated_files: List[Dict]) -> List[Dict]:
+        """Add several associated file records to a dataset, in one request when the server supports it.
+
+        See CrucibleClient.add_associated_files_bulk for the arguments.
+
+        Returns:
+            List[Dict]: Created associated file objects
+        """
+        associated_files = list(associated_files)
+        if not associated_files:
+            return []
+
+        async def add_one(af):
+            return (await self._request('post', f'/datasets/{dsid}/associated_files', json=af))[-1]
+        return await self._batch_or_gather(
+            'bulk_associated_files', f'/datasets/{dsid}/associated_files:batch',
+            {'associated_files': associated_files},
+            lambda: [add_one(af) for af in associated_files])
+
+    async def upload_dataset_file(self, dsid: str, file_path: str, verbose=True) -> Dict:
+        """Upload a file to a dataset.
+
+        Files small enough for the upload endpoint are sent on the async pool;
+        larger ones go through the blocking bucket transfer in a worker thread.
+
+        Args:
+            dsid (str): Dataset unique identifier
+            file_path (str): Local path to file to upload
+
+        Returns:
+            Dict: Upload response
+        """
+        # picking the route may fetch the server capabilities, keep it off the loop
+        route = await self._run_sync(self.sync._upload_route, os.path.getsize(file_path))
+        if route != 'multipart':
+            return await self._run_sync(self.sync.upload_dataset_file, dsid, file_path, verbose, _route=route)
+
+        if verbose:
+            print(f"uploading file {file_path}...")
+        with open(file_path, 'rb') as f:
+            fname = os.path.basename(file_path)
+            files = [('files', (fname, f, 'application/octet-stream'))]
+            return await self._request('post', f'/datasets/{dsid}/upload', files=files)
+
+    async def create_new_dataset(self,
+                                 dataset: BaseDataset,
+                                 scientific_metadata: Optional[dict] = {},
+                                 keywords: Optional[List[str]] = None,
+                                 get_user_info_function = None,
+                                 verbose = False) -> Dict:
+        """Create a dataset record, then add its scientific metadata and keywords concurrently.
+
+        Like the sync client, uses the atomic create endpoint instead when the server advertises it.
+
+        See CrucibleClient.create_new_dataset for the arguments.
+
+        Returns:
+            dict: Dictionary containing created_record, scientific_metadata_record and dsid
+        """
+        clean_dataset = await self._run_sync(self.sync._prepare_dataset_record, dataset, get_user_info_function)
+        if verbose:
+            print('creating new dataset record...')
+
+        # record, metadata and keywords in one transaction if the server advertises it
+        if await self._run_sync(self.sync._capability, 'atomic_create'):
+            created = await self._request('post', '/datasets:createWithMetadata',
+                                          json={"dataset": clean_dataset,
+                                                "scientific_metadata": scientific_metadata,
+                                                "keywords": keywords or []})
+            return {"created_record": created['dataset'],
+                    "scientific_metadata_record": created.get('scientific_metadata'),
+                    "dsid": created['dataset']['unique_id']}
+
+        new_ds_record = await self._request('post', '/datasets', json=clean_dataset)
+        dsid = new_ds_record['unique_id']
+
+        pending = [self.add_dataset_keywords_bulk(dsid, keywords or [])]
+        if scientific_metadata is not None:
+            pending.append(self._request('post', f'/datasets/{dsid}/scientific_metadata', json=scientific_metadata))
+        results = await asyncio.gather(*pending)
+        scimd = results[1] if scientific_metadata is not None else None
+
+        return {"created_record": new_ds_record, "scientific_metadata_record": scimd, "dsid": dsid}
+
+    async def create_new_dataset_from_files(self,
+                                            dataset: BaseDataset,
+                                            files_to_upload: List[str],
+                                            scientific_metadata: Optional[dict] = None,
+                                            keywords: Optional[List[str]] = None,
+                                            get_user_info_function = None,
+                                            ingestor = 'ApiUploadIngestor',
+                                            verbose = False,
+                                            wait_for_ingestion_response = True
+                                            ) -> Dict:
+        """Build a new dataset with file upload and ingestion, uploading the files concurrently.
+
+        See CrucibleClient.create_new_dataset_from_files for the arguments.
+
+        Returns:
+            dict: Dictionary containing created_record, scientific_metadata_record, ingestion_request and uploaded_files
+        """
+        cleaned_dataset, main_file_cloud = self.sync._dataset_for_upload(dataset, files_to_upload)
+        result = await self.create_new_dataset(cleaned_dataset,
+                                               scientific_metadata=scientific_metadata,
+                                               keywords=keywords,
+                                               get_user_info_function=get_user_info_function,
+                                               verbose=verbose)
+        dsid = result["dsid"]
+
+        uploaded_files = await asyncio.gather(*[self.upload_dataset_file(dsid, each_file, verbose)
+                                                for each_file in files_to_upload])
+
+        if verbose:
+            print(f"submitting {dsid} to be ingested from file {main_file_cloud} using the class {ingestor}")
+        params = {"ingestion_class": ingestor, "file_to_upload": main_file_cloud}
+        ingest_req_info = await self._request('post', f'/datasets/{dsid}/ingest', params=params)
+
+        if wait_for_ingestion_response:
+            ingest_req_info = await self._wait_for_request_completion(dsid, ingest_req_info['id'], 'ingest')
+
+        return {"created_record": result["created_record"],
+                "scientific_metadata_record": result["scientific_metadata_record"],
+                "ingestion_request": ingest_req_info,
+                "uploaded_files": list(uploaded_files)}
+
+    async def get_request_status(self, dsid: str, reqid: str, request_type: str) -> Dict:
+        """Get the status of any type of request.
+
+        Args:
+            dsid (str): Dataset ID
+            reqid (str): Request ID
+            request_type (str): Type of request ('ingest' or 'scicat_update')
+
+        Returns:
+            Dict: Request status information
+        """
+        endpoint = CrucibleClient._STATUS_ENDPOINTS.get(request_type)
+        if endpoint is None:
+            raise ValueError(f"Unsupported request_type: {request_type}")
+        return await self._request('get', f'/datasets/{dsid}/{endpoint}/{reqid}')
+
+    async def _update_request_status(self, request_type: str, dsid: str, reqid: str, status: str,
+                                     timezone: str = "America/Los_Angeles"):
+        """PATCH the status of a request, stamping the completion time when it is complete.
+
+        Like the sync client, returns the response itself without raising for its status.
+
+        Returns:
+            httpx.Response: HTTP response from the update request
+        """
+        patch_json = {"id": reqid, "status": status}
+        if status == "complete":
+            patch_json["time_completed"] = get_tz_isoformat(timezone)
+
+        url = f"{self.sync._base}datasets/{dsid}/{request_type}/{reqid}"
+        kwargs = _encode_json({'json': patch_json})
+        if isinstance(kwargs.get('data'), bytes):
+            kwargs['content'] = kwargs.pop('data')
+        return await self._client.patch(url, **kwargs)
+
+    async def update_ingestion_status(self, dsid: str, reqid: str, status: str, timezone: str = "America/Los_Angeles"):
+        """Update the status of a dataset ingestion request. **Requires admin permissions.**"""
+        return await self._update_request_status('ingest', dsid, reqid, status, timezone)
+
+    async def update_scicat_upload_status(self, dsid: str, reqid: str, status: str, timezone: str = "America/Los_Angeles"):
+        """Update the status of a SciCat upload request. **Requires admin permissions.**"""
+        return await self._update_request_status('scicat_update', dsid, reqid, status, timezone)
+
+    async def update_transfer_status(self, dsid: str, reqid: str, status: str, timezone: str = "America/Los_Angeles"):
+        """Update the status of a dataset transfer request. **Requires admin permissions.**"""
+        return await self._update_request_status('google_drive_transfer', dsid, reqid, status, timezone)
+
+    async def _wait_for_request_completion(self, dsid: str, reqid: str, request_type: str,
+                                           sleep_interval: float = 0.5, max_interval: float = 30,
+                                           backoff: float = 1.5, max_attempts: Optional[int] = None) -> Dict:
+        """Wait for a request to complete, polling with the same backoff as the sync client.
+
+        See CrucibleClient._wait_for_request_completion for the arguments.
+
+        Returns:
+            Dict: Final request status information
+
+        Raises:
+            TimeoutError: If the request is still pending after max_attempts status checks
+        """
+        req_info = await self.get_request_status(dsid, reqid, request_type)
+        delay = sleep_interval
+        attempts = 1
+        while req_info['status'] in ['requested', 'started']:
+            if max_attempts is not None and attempts >= max_attempts:
+                raise TimeoutError(f"{request_type} request {reqid} still {req_info['status']} after {attempts} status checks")
+            attempts += 1
+            await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(delay * backoff, max_interval)
+            req_info = await self.get_request_status(dsid, reqid, request_type)
+        return req_info
+
+    async def wait_for_requests(self, requests_to_wait: List[Tuple[str, str, str]],
+                                max_concurrency: int = 16) -> List[Dict]:
+        """Wait for several requests to complete, polling them concurrently.
+
+        Args:
+            requests_to_wait (List[Tuple[str, str, str]]): (dsid, reqid, request_type) of each request
+            max_concurrency (int): Maximum number of requests polled at once (default: 16)
+
+        Returns:
+            List[Dict]: Final request status information, in the same order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def poll(dsid, reqid, request_type):
+            async with semaphore:
+                return await self._wait_for_request_completion(dsid, reqid, request_type)
+        return list(await asyncio.gather(*[poll(*req) for req in requests_to_wait]))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caches for API responses.
+
+DiskCache persists entries between runs: each entry is stored as a small JSON
+file (named after the hash of its key) in the cache directory, together with
+its expiration time. memoize keeps the results of a function in memory.
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from functools import wraps
+from collections import OrderedDict
+from pathlib import Path
+
+
+class DiskCache:
+    """
+    Key/value store of JSON-serializable values with a per-entry time-to-live.
+
+    Safe to share between processes: entries are written to a temporary file
+    and moved into place, so readers never see a partially written entry.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(os.path.expanduser(str(cache_dir)))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.cache_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key, default=None):
+        """Return the value stored for key, or default if missing or expired."""
+        try:
+            with open(self._path(key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return default
+
+        if entry.get("expires", 0) < time.time():
+            self.delete(key)
+            return default
+        return entry["value"]
+
+    def set(self, key, value, ttl):
+        """Store value for key, valid for ttl seconds."""
+        entry = {"key": key, "expires": time.time() + ttl, "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def delete(self, key):
+        """Remove the entry for key, if any."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Remove all entries."""
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def memoize(func, maxsize=1024, ttl=None, cache_error=None, error_ttl=None):
+    """
+    Wrap func with an in-memory, least-recently-used cache of its results.
+
+    Works like functools.lru_cache, except that entries also expire ttl seconds
+    after they were stored. Exceptions are not cached, unless cache_error
+    accepts them: those are raised again for the same arguments until error_ttl
+    runs out, e.g. to remember for a while that a resource does not exist. The
+    wrapper is thread safe and exposes cache_clear().
+
+    Args:
+        func: Function to memoize; its arguments must be hashable
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Lifetime of an entry in seconds (default: None, no expiry)
+        cache_error (callable): Predicate selecting the exceptions to cache (default: None, none)
+        error_ttl (float): Lifetime of a cached exception in seconds (default: ttl)
+    """
+    entries = OrderedDict()
+    lock = threading.Lock()
+    if error_ttl is None:
+        error_ttl = ttl
+
+    def store(key, value, lifetime):
+        with lock:
+            entries[key] = (time.monotonic() + lifetime if lifetime is not None else None, value)
+            entries.move_to_end(key)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            entry = entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                entries.move_to_end(key)
+                value = entry[1]
+            else:
+                entry = None
+        if entry is not None:
+            if isinstance(value, _CachedError):
+                raise value.copy()
+            return value
+
+        try:
+            value = func(*args, **kwargs)
+        except Exception as err:
+            if cache_error is not None and cache_error(err):
+                store(key, _CachedError(err), error_ttl)
+            raise
+        store(key, value, ttl)
+        return value
+
+    def cache_clear():
+        with lock:
+            entries.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+class _CachedError:
+    """An exception remembered by memoize, kept apart from regular results.
+
+    Only a copy without the traceback is kept, so the frames of the failed call
+    are not held alive, and every hit raises a fresh copy of its own.
+    """
+
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = copy.copy(error).with_traceback(None)
+
+    def copy(self):
+        return copy.copy(self.error)
@@ -41,6 +41,7 @@ class Config:
         """Initialize and load configuration."""
         self._data = {}
         self._client = None
+        self._cache_dir = None
         self._load()
 
     def _load(self):
@@ -114,6 +115,9 @@ class Config:
         Returns:
             Path: The cache directory path
         """
+        if self._cache_dir is not None:
+            return self._cache_dir
+
         cache_dir_str = self._data.get('cache_dir')
 
         if cache_dir_str is None:
@@ -123,8 +127,9 @@ class Config:
             # Expand ~ and convert to Path
             cache_path = Path(os.path.expanduser(cache_dir_str))
 
-        # Ensure the cache directory exists
+        # Ensure the cache directory exists (only once, the path is cached)
         cache_path.mkdir(parents=True, exist_ok=True)
+        self._cache_dir = cache_path
 
         return cache_path
 
@@ -189,6 +194,7 @@ class Config:
         """Reload configuration from all sources."""
         self._data.clear()
         self._client = None
+        self._cache_dir = None
         self._load()
 
 
@@ -238,6 +244,8 @@ def get_cache_dir():
     2. cache_dir from ~/.config/pycrucible/config.ini
     3. Default: ~/.cache/pycrucible/ (platform-specific)
 
+    The path is resolved (and created) once and reused until config.reload().
+
     Returns:
         Path: The cache directory path
     """
@@ -293,6 +301,8 @@ def get_client():
     """
     Get a configured CrucibleClient instance.
 
+    The client is created once and shared until config.reload().
+
     Returns:
         CrucibleClient: Configured client instance
 
@@ -9,13 +9,28 @@ Created on Tue Feb 10 17:22:34 2026
 from .base import BaseParser
 
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 #%%
 
+# LAMMPS variable references: ${name} or $x (single character names only)
+_VAR_RE = re.compile(r"\$(?:\{(\w+)\}|(\w))")
+
+# input script commands that carry metadata
+_INPUT_COMMANDS = {"read_data", "variable", "dump", "log"}
+
 def store_variable(varname, varvalue, vardict):
     vardict[varname] = varvalue
     return
 
+def substitute_variables(string, vardict):
+    """Replace LAMMPS variable references in string with values from vardict."""
+    def _lookup(match):
+        varname = match.group(1) or match.group(2)
+        return vardict.get(varname, match.group(0))
+    return _VAR_RE.sub(_lookup, string)
+
 class LAMMPSParser(BaseParser):
     
     _measurement = "LAMMPS"
@@ -35,16 +50,18 @@ class LAMMPSParser(BaseParser):
         # build list of files to upload (only input, data, and log files)
         files_to_upload = [input_file]
 
-        # then read data file
+        # data and log files are independent: read them concurrently
         data_file = os.path.join(lmp_metadata["root"], lmp_metadata["data_file"])
-        data_file_metadata = self.read_data_file(data_file)
-        lmp_metadata.update(data_file_metadata)
-        files_to_upload.append(data_file)
-
-        # now read LOG file
         log_file = os.path.join(lmp_metadata["root"], lmp_metadata["log_files"][0])
-        log_file_metadata = self.read_log_file(log_file)
-        lmp_metadata.update(log_file_metadata)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            fut_data = pool.submit(self.read_data_file, data_file)
+            fut_log  = pool.submit(self.read_log_file, log_file)
+
+            lmp_metadata.update(fut_data.result())
+            lmp_metadata.update(fut_log.result())
+
+        files_to_upload.append(data_file)
         # files_to_upload.append(log_file)
 
         # Note: dump files are parsed but not uploaded by default
@@ -84,26 +101,27 @@ class LAMMPSParser(BaseParser):
         with open(input_file, "r") as fin:
             
             for line in fin:
-                
-                if line.startswith("read_data"): # see dump section
-                    data_file = line.split()[1]
-                    data["data_file"] = data_file
-                
-                if line.startswith("variable"):
-                    varname  = line.split()[1]
-                    varvalue = line.split()[3]
-                    store_variable(varname, varvalue, vardict)
-                    
-                if line.startswith("dump "): #those should end up into self.associated_files
-                    dumpname = line.split()[5]
-                    dumpname = dumpname.replace("$", "")
-                    data["dump_files"].append(dumpname.format(**vardict))
-                    
-                if line.startswith("log "):
-                    logname = line.split()[1]
-                    logname = logname.replace("$", "")
-                    data["log_files"].append(logname.format(**vardict))
-                    
+
+                # dispatch on the command name only, most lines are skipped
+                args = line.split(None, 1)
+                if not args or args[0] not in _INPUT_COMMANDS:
+                    continue
+
+                command = args[0]
+                args = line.split()
+
+                if command == "read_data": # see dump section
+                    data["data_file"] = args[1]
+
+                elif command == "variable":
+                    store_variable(args[1], args[3], vardict)
+
+                elif command == "dump": #those should end up into self.associated_files
+                    data["dump_files"].append(substitute_variables(args[5], vardict))
+
+                elif command == "log":
+                    data["log_files"].append(substitute_variables(args[1], vardict))
+
         # if no log specified use the standard one
         if not data["log_files"]:
             data["log_files"]  = ["log.lammps"]
@@ -115,6 +133,8 @@ class LAMMPSParser(BaseParser):
         
         try:
             import ase.io.lammpsdata
+            from ase.data import chemical_symbols
+            import numpy as np
         except:
             raise ImportError("ASE needs to be installed for LMP ingestor to work!")
             
@@ -125,9 +145,11 @@ class LAMMPSParser(BaseParser):
         #TODO this should not stay like that --> should be a json
         # data["atoms"] = ase_atoms.todict()
         
-        # store some info about the system to metadata
-        data['elements'] = list(set(ase_atoms.get_chemical_symbols()))
-        data['natoms']   = len(ase_atoms.get_chemical_symbols())
+        # store some info about the system to metadata (work on the atomic
+        # numbers array, only map the distinct ones to symbols)
+        numbers = ase_atoms.numbers
+        data['elements'] = [chemical_symbols[z] for z in np.unique(numbers).tolist()]
+        data['natoms']   = int(numbers.shape[0])
         data["volume"]   = ase_atoms.get_volume()
 
         # what else do we want from the data_file
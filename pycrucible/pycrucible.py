@@ -1,15 +1,153 @@
 import os
 import re
 import time
+import base64
+import hashlib
+import random
+import threading
 import requests
 import json
-from typing import Optional, List, Dict, Any
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from typing import Optional, List, Dict, Any, Tuple
+from collections import OrderedDict
+from urllib.parse import urlencode
 from .models import BaseDataset
-from .utils import get_tz_isoformat, run_shell, checkhash
+from .cache import DiskCache, memoize
+from .utils import get_tz_isoformat, run_shell, checkhash, hashing_file_iter, stat_and_hash
 from .constants import AVAILABLE_INGESTORS
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pybase64
+    _b64encode = pybase64.b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+try:
+    from google.cloud import storage as gcs
+    from google.cloud.storage import transfer_manager
+    from google.auth.exceptions import DefaultCredentialsError
+except ImportError:
+    gcs = None
+
+
+# bytes copied per read when writing downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# characters suggesting a download file_name was meant as a regular expression
+_REGEX_METACHARACTERS = set('*+?[](){}|^$\\')
+
+
+def _json_loads(content):
+    """Parse a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _encode_json(kwargs: Dict) -> Dict:
+    """Serialize a `json=` request argument with orjson when it is installed.
+
+    The payload is moved to `data=` with a JSON content type; without orjson
+    the arguments are returned unchanged and requests falls back to the stdlib.
+    With orjson, numpy arrays and scalars (e.g. in scientific metadata) are
+    serialized natively as JSON lists and numbers.
+    """
+    if orjson is None or kwargs.get('json') is None:
+        return kwargs
+    kwargs['data'] = orjson.dumps(kwargs.pop('json'),
+                                  option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    kwargs['headers'] = {**kwargs.get('headers', {}), 'Content-Type': 'application/json'}
+    return kwargs
+
+def _is_json(response) -> bool:
+    """Whether a response body should be parsed as JSON: declared as JSON, or of undeclared type."""
+    content_type = response.headers.get('Content-Type')
+    return content_type is None or 'json' in content_type
+
+
+def _is_not_found(err: Exception) -> bool:
+    """Whether a request failed because the resource does not exist (404)."""
+    return (isinstance(err, requests.exceptions.HTTPError) and err.response is not None
+            and err.response.status_code == 404)
+
+
+def _sample_info(unique_id=None, sample_name=None, sample_type=None, owner_orcid=None, owner_id=None,
+                 description=None, project_id=None, creation_date=None) -> Dict:
+    """Sample fields as sent to the API, leaving out the ones that are not set."""
+    sample_info = {}
+    for key, value in (("unique_id", unique_id),
+                       ("sample_name", sample_name),
+                       ("sample_type", sample_type),
+                       ("owner_orcid", owner_orcid),
+                       ("owner_user_id", owner_id),
+                       ("description", description),
+                       ("project_id", project_id),
+                       ("date_created", creation_date)):
+        if value is not None:
+            sample_info[key] = value
+    return sample_info
+
+
 class CrucibleClient:
-    def __init__(self, api_url: str, api_key: str):
+
+    # idempotent lookups memoized per client instance (see invalidate_cache)
+    _CACHED_LOOKUPS = ('get_project', 'get_user', 'get_instrument', 'get_sample',
+                       'list_instruments', 'get_dataset_access_groups')
+
+    # lifetime of the memoized lookups (seconds)
+    _LOOKUP_TTL = 5 * 60
+
+    # lookups that failed with 404 Not Found are remembered for a shorter time
+    _NOT_FOUND_TTL = 30
+
+    # request types whose status can be polled, mapped to their url segment
+    _STATUS_ENDPOINTS = {'ingest': 'ingest', 'scicat_update': 'scicat_update'}
+
+    # times a dropped download is resumed from where it stopped, see _download_one
+    _DOWNLOAD_RESUMES = 3
+
+    # number of GET responses kept for conditional requests, see _request
+    _ETAG_CACHE_SIZE = 256
+
+    # lifetime of the entries in the on-disk cache (seconds); signed urls are valid for 1 hour
+    _DOWNLOAD_LINKS_TTL = 55 * 60
+    _METADATA_TTL = 24 * 60 * 60
+
+    # optional server features, see _capability
+    _FEATURES = ('inline_metadata', 'bulk_links', 'bulk_keywords', 'atomic_create', 'chunked_upload',
+                 'bulk_associated_files')
+
+    # destination of large uploads, picked up by the ingestion service
+    _UPLOAD_BUCKET = 'crucible-uploads'
+    _UPLOAD_PREFIX = 'api-uploads'
+
+    # upload routing by file size (bytes), see _upload_route
+    _MULTIPART_MAX_SIZE = 8 * 1024 * 1024
+    _UPLOAD_ENDPOINT_MAX_SIZE = 100_000_000
+    _CHUNKED_MAX_SIZE = 2 * 1024 ** 3
+    # once the upload speed is known, the chunked upload is used for files
+    # it can send within this time (seconds)
+    _CHUNKED_MAX_SECONDS = 10 * 60
+    # extra attempts for a chunk of a chunked upload
+    _CHUNK_RETRIES = 3
+
+    def __init__(self, api_url: str, api_key: str, cache: bool = True, cache_dir: Optional[str] = None,
+                 transport: str = "requests"):
         """
         Initialize the Crucible API client.  
         This client provides access to the Molecular Foundry data lakehouse which contains
@@ -20,35 +158,269 @@ class CrucibleClient:
         Args:
             api_url: Base URL for the Crucible API
             api_key: API key for authentication
+            cache: Memoize the results of project, user, instrument, sample and
+                   access group lookups for 5 minutes (default: True).
+                   Changes made through this client clear the affected lookups;
+                   changes made elsewhere are picked up once the entries expire,
+                   or immediately after invalidate_cache(). Expired lookups are
+                   revalidated with a conditional GET when the server sends ETags.
+            cache_dir: Directory for a persistent cache shared between runs (default: None, disabled).
+                   Download links are kept for 55 minutes; scientific metadata, projects
+                   and instruments for 24 hours. Clear it with client.disk_cache.clear().
+            transport: HTTP client for the API calls, "requests" (default) or "httpx".
+                   "httpx" multiplexes concurrent calls (e.g. the parallel uploads and
+                   links) over a single HTTP/2 connection; it requires pycrucible[async].
+                   Errors are raised as requests exceptions either way, and file
+                   downloads always use requests.
         """
         self.api_url = api_url.rstrip('/')
+        # prefix of every request url
+        self._base = self.api_url + '/'
         self.api_key = api_key
         self.headers = {"Authorization": f"Bearer {api_key}"}
+
+        # persistent session: keep-alive connections are reused across calls
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # transient failures of idempotent calls are retried inside the pool;
+        # once retries run out the last response is returned to raise_for_status.
+        # POST is left out on purpose: a retried create could duplicate records
+        retries = Retry(total=5, backoff_factor=0.3,
+                        status_forcelist=[429, 502, 503, 504],
+                        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"PATCH"},
+                        respect_retry_after_header=True,
+                        raise_on_status=False)
+        pool_maxsize = 32
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # signed download urls point to the storage bucket: keep them on a
+        # separate pool that does not send the API key
+        self._download_session = requests.Session()
+        download_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        self._download_session.mount("https://", download_adapter)
+        self._download_session.mount("http://", download_adapter)
+
+        # optional HTTP/2 client replacing self.session for the API calls
+        if transport == "httpx":
+            if httpx is None:
+                raise ImportError("httpx needs to be installed for the httpx transport: pip install pycrucible[async]")
+            limits = httpx.Limits(max_keepalive_connections=8, max_connections=32, keepalive_expiry=30)
+            self._http = httpx.Client(headers=self.headers, timeout=10,
+                                      transport=httpx.HTTPTransport(http2=True, limits=limits, retries=3))
+        elif transport == "requests":
+            self._http = None
+        else:
+            raise ValueError(f"Unsupported transport: {transport}")
+
+        # worker threads shared by the concurrent calls of this client; only
+        # single requests/transfers are submitted, never tasks that wait on the
+        # pool themselves, and there are fewer workers than pooled connections
+        self._executor = ThreadPoolExecutor(max_workers=min(8, pool_maxsize), thread_name_prefix='pycrucible')
+        # full-file hashes run for minutes on large files: keep them off the
+        # shared pool so requests and uploads never queue behind them; two
+        # workers, so they overlap with the transfers without competing with
+        # them for disk reads
+        self._hash_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pycrucible-hash')
+
+        # persistent cache for slowly changing responses
+        self.disk_cache = DiskCache(cache_dir) if cache_dir is not None else None
+        self._cache_owner = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+
+        # optional server features advertised by /capabilities (fetched on first use)
+        self._caps = None
+
+        # (url, query) -> (etag, body) of the last GET responses carrying an ETag
+        self._etag_cache = OrderedDict()
+        self._etag_lock = threading.Lock()
+
+        # chunked upload settings, and its moving average speed (bytes/s)
+        self.chunk_size = 16 * 1024 * 1024
+        self.chunk_parallel = 4
+        self._upload_goodput = None
+
+        # instruments keyed by name, loaded on first use by get_or_add_instrument
+        self._instruments_by_name = None
+
+        # per-instance lru caches shadowing the lookup methods
+        self.cache = cache
+        if cache:
+            for name in self._CACHED_LOOKUPS:
+                setattr(self, name, memoize(getattr(self, name), maxsize=1024, ttl=self._LOOKUP_TTL,
+                                            cache_error=_is_not_found, error_ttl=self._NOT_FOUND_TTL))
     
 
+    def close(self):
+        """Close the pooled connections held by the client."""
+        self._executor.shutdown(wait=False)
+        self._hash_executor.shutdown(wait=False)
+        self.session.close()
+        self._download_session.close()
+        if self._http is not None:
+            self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def _request(self, method: str, endpoint: str, **kwargs) -> Any:
         """Make an HTTP request to the API.
         
         Args:
             method: HTTP method (get, post, put, delete)
             endpoint: API endpoint path
-            **kwargs: Additional arguments to pass to requests
+            **kwargs: Additional arguments to pass to requests (per-call
+                      headers are merged with the session headers)
         
+        GET responses carrying an ETag are remembered, and repeated GETs of the
+        same url are sent as conditional requests: on 304 Not Modified the
+        remembered body is parsed again instead of downloading it. Responses
+        without a body (204 No Content, Content-Length: 0) return None unread.
+
         Returns:
             Parsed JSON response
         """
-        url = f"{self.api_url}/{endpoint.lstrip('/')}"
-        kwargs['headers'] = {**kwargs.get('headers', {}), **self.headers}
-        response = requests.request(method, url, timeout = 10, **kwargs,)
-        response.raise_for_status()
+        url = self._base + endpoint.lstrip('/')
+        kwargs.setdefault('timeout', 10)
+
+        etag_key = cached = None
+        if method.lower() == 'get' and not kwargs.get('stream'):
+            etag_key = (url, urlencode(sorted((kwargs.get('params') or {}).items()), doseq=True))
+            with self._etag_lock:
+                cached = self._etag_cache.get(etag_key)
+            if cached is not None:
+                kwargs['headers'] = {**(kwargs.get('headers') or {}), 'If-None-Match': cached[0]}
+
+        if self._http is not None:
+            response = self._httpx_request(method, url, **_encode_json(kwargs))
+        else:
+            if method.lower() == 'delete':
+                # deletes mostly answer 204; only read a body if there is one
+                kwargs.setdefault('stream', True)
+            response = self.session.request(method, url, **_encode_json(kwargs))
+            response.raise_for_status()
+
+        if response.status_code == 204 or (response.status_code != 304
+                                           and response.headers.get('Content-Length') == '0'):
+            response.close()
+            return None
+
+        content = response.content
+        if etag_key is not None:
+            if response.status_code == 304 and cached is not None:
+                content = cached[1]
+            elif response.headers.get('ETag'):
+                with self._etag_lock:
+                    self._etag_cache[etag_key] = (response.headers['ETag'], content)
+                    self._etag_cache.move_to_end(etag_key)
+                    while len(self._etag_cache) > self._ETAG_CACHE_SIZE:
+                        self._etag_cache.popitem(last=False)
+        if not content:
+            return None
+        if response.status_code != 304 and not _is_json(response):
+            return response
         try:
-            if response.content:
-                return response.json()
-            else:
-                return None
-        except:
+            return _json_loads(content)
+        except ValueError:
+            # not a JSON body
             return response
-    
+
+    def _httpx_request(self, method: str, url: str, **kwargs):
+        """Send a request on the httpx transport, raising the equivalent requests exceptions."""
+        if isinstance(kwargs.get('data'), bytes):
+            kwargs['content'] = kwargs.pop('data')
+        try:
+            response = self._http.request(method, url, **kwargs)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except httpx.HTTPStatusError as err:
+            raise requests.exceptions.HTTPError(str(err), response=err.response) from err
+        except httpx.TimeoutException as err:
+            raise requests.exceptions.Timeout(str(err)) from err
+        except httpx.TransportError as err:
+            raise requests.exceptions.ConnectionError(str(err)) from err
+        return response
+
+    def _capability(self, name: str) -> bool:
+        """Whether the server advertises an optional feature (one of _FEATURES).
+
+        The server's /capabilities listing is fetched once, on first use. A
+        server that does not publish one gets none of the optional features:
+        they are never probed with live calls.
+        """
+        if self._caps is None:
+            try:
+                advertised = self._request('get', '/capabilities')
+            except requests.exceptions.RequestException:
+                advertised = None
+            if not isinstance(advertised, list):
+                advertised = []
+            self._caps = {feature: feature in advertised for feature in self._FEATURES}
+        return self._caps.get(name, False)
+
+    def _disk_cached_get(self, endpoint: str, ttl: float, params: Optional[Dict] = None) -> Any:
+        """GET an endpoint through the on-disk cache (plain GET if the cache is disabled).
+
+        Only JSON objects and lists are stored, so missing resources are not cached.
+        """
+        if self.disk_cache is None:
+            return self._request('get', endpoint, params=params)
+
+        key = self._disk_cache_key(endpoint, params)
+        cached = self.disk_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._request('get', endpoint, params=params)
+        if isinstance(result, (dict, list)) and result:
+            self.disk_cache.set(key, result, ttl)
+        return result
+
+    def _disk_cache_key(self, endpoint: str, params: Optional[Dict] = None) -> str:
+        """Key of a GET in the on-disk cache.
+
+        Responses depend on who asks (signed links, access-restricted records),
+        so the key starts with a hash of the API key: clients with different
+        keys can share a cache directory without reading each other's entries.
+        """
+        key = f"{self._cache_owner}:{self._base}{endpoint.lstrip('/')}"
+        if params:
+            key = f"{key}?{urlencode(sorted(params.items()))}"
+        return key
+
+    def _disk_cache_delete(self, *endpoints: str):
+        """Drop the on-disk cache entries of GETs (without query parameters) of endpoints."""
+        if self.disk_cache is not None:
+            for endpoint in endpoints:
+                self.disk_cache.delete(self._disk_cache_key(endpoint))
+
+    def invalidate_cache(self, *names: str):
+        """Clear the memoized results of the lookup methods.
+
+        Args:
+            *names: Lookup methods to clear, e.g. 'get_user' (default: all of them)
+        """
+        names = names or self._CACHED_LOOKUPS
+        for name in names:
+            cached_method = self.__dict__.get(name)
+            if cached_method is not None:
+                cached_method.cache_clear()
+        if 'get_instrument' in names or 'list_instruments' in names:
+            self._instruments_by_name = None
+
+    def clear_cache(self):
+        """Drop everything the client keeps in memory: the memoized lookups
+        and the responses remembered for conditional GETs.
+
+        The persistent cache is separate, see client.disk_cache.clear().
+        """
+        self.invalidate_cache()
+        with self._etag_lock:
+            self._etag_cache.clear()
+
     def get_project(self, project_id: str) -> Dict:
         """Get details of a specific project.
 
@@ -58,7 +430,7 @@ class CrucibleClient:
         Returns:
             Dict: Complete project information
         """
-        return self._request('get', f'/projects/{project_id}')
+        return self._disk_cached_get(f'/projects/{project_id}', self._METADATA_TTL)
 
     def list_projects(self, orcid: str = None, limit: int = 100) -> List[Dict]:
         """List all accessible projects.
@@ -70,10 +442,11 @@ class CrucibleClient:
         Returns:
             List[Dict]: Project metadata including project_id, project_name, description, project_lead_email
         """
+        params = {'limit': limit}
         if orcid is None:
-            return self._request('get', '/projects')
+            return self._request('get', '/projects', params=params)
         else:
-            return self._request('get', f'/users/{orcid}/projects')
+            return self._request('get', f'/users/{orcid}/projects', params=params)
 
     
     def get_user(self, orcid: str = None, email: str = None) -> Dict:
@@ -93,11 +466,12 @@ class CrucibleClient:
         if orcid:
             return self._request('get', f'/users/{orcid}')
         elif email:
-            params = {"email": email}
-            result = self._request('get', '/users', params=params)
+            # query both email fields at once; a match on email takes precedence
+            by_email = self._executor.submit(self._request, 'get', '/users', params={"email": email})
+            by_lbl_email = self._executor.submit(self._request, 'get', '/users', params={"lbl_email": email})
+            result = by_email.result()
             if not result:
-                params = {"lbl_email": email}
-                result = self._request('get', '/users', params=params)
+                result = by_lbl_email.result()
             if len(result) > 0:
                 return result[-1]
             else:
@@ -118,7 +492,7 @@ class CrucibleClient:
         Returns:
             List[Dict]: Project team members (excludes project lead)
         """
-        result = self._request('get', f'/projects/{project_id}/users')
+        result = self._request('get', f'/projects/{project_id}/users', params={'limit': limit})
         return result
     
     def get_dataset(self, dsid: str, include_metadata: bool = False) -> Dict:
@@ -131,14 +505,47 @@ class CrucibleClient:
         Returns:
             Dict: Dataset object with optional metadata
         """
+        if not include_metadata:
+            return self._request('get', f'/datasets/{dsid}')
+
+        # one request if the server can inline the metadata; a dataset
+        # without metadata comes back without the field
+        if self._capability('inline_metadata'):
+            dataset = self._request('get', f'/datasets/{dsid}', params={'include_metadata': True})
+            if dataset:
+                dataset.setdefault('scientific_metadata', {})
+            return dataset
+
+        # otherwise fetch the dataset and its metadata concurrently
+        fut_metadata = self._executor.submit(self._get_metadata_or_empty, dsid)
         dataset = self._request('get', f'/datasets/{dsid}')
-        if dataset and include_metadata:
-            try:
-                metadata = self._request('get', f'/datasets/{dsid}/scientific_metadata')
-                dataset['scientific_metadata'] = metadata or {}
-            except requests.exceptions.RequestException:
-                dataset['scientific_metadata'] = {}
+        metadata = fut_metadata.result()
+        if dataset:
+            dataset['scientific_metadata'] = metadata
         return dataset
+
+    def _get_metadata_or_empty(self, dsid: str) -> Dict:
+        """Scientific metadata of a dataset, empty if it cannot be retrieved."""
+        try:
+            return self._request('get', f'/datasets/{dsid}/scientific_metadata') or {}
+        except requests.exceptions.RequestException:
+            return {}
+
+    def get_datasets_bulk(self, dsids: List[str], include_metadata: bool = False,
+                          max_concurrency: int = 16) -> List[Dict]:
+        """Get several datasets concurrently.
+
+        Args:
+            dsids (List[str]): Dataset unique identifiers
+            include_metadata (bool): Whether to include scientific metadata
+            max_concurrency (int): Maximum number of datasets fetched at once (default: 16)
+
+        Returns:
+            List[Dict]: Dataset objects, in the same order as dsids
+        """
+        # own pool: get_dataset itself uses the shared executor for the metadata
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(partial(self.get_dataset, include_metadata=include_metadata), dsids))
     
 
     def list_datasets(self, sample_id: Optional[str] = None, include_metadata: bool = False, limit: int = 100, **kwargs) -> List[Dict]:
@@ -186,10 +593,12 @@ class CrucibleClient:
         Example:
             client.update_dataset("my-dataset-id", dataset_name="Updated Name", public=True)
         """
-        return self._request('patch', f'/datasets/{dsid}', json=updates)
+        updated = self._request('patch', f'/datasets/{dsid}', json=updates)
+        self.invalidate_cache('get_sample', 'get_dataset_access_groups')
+        return updated
 
 
-    def upload_dataset_file(self, dsid: str, file_path: str, verbose=True) -> Dict:
+    def upload_dataset_file(self, dsid: str, file_path: str, verbose=True, _route: Optional[str] = None) -> Dict:
         """Upload a file to a dataset.
 
         Args:
@@ -202,38 +611,195 @@ class CrucibleClient:
         if verbose:
                     print(f"uploading file {file_path}...")
 
-        use_upload_endpoint = self.check_small_files([file_path])
+        # callers running this on the shared executor pass the route they
+        # picked: it must not turn into a chunked upload, whose chunks would
+        # wait on that same pool
+        size = os.path.getsize(file_path)
+        route = _route or self._upload_route(size)
 
-        if use_upload_endpoint: 
+        if route == 'multipart':
             with open(file_path, 'rb') as f:
                 fname = os.path.basename(file_path)
                 files = [('files', (fname, f, 'application/octet-stream'))]
-                added_af = self._request('post', f'/datasets/{dsid}/upload', files=files)
+                if self._http is None:
+                    # stream the multipart body from disk instead of building it in memory
+                    encoder = MultipartEncoder(fields=files)
+                    added_af = self._request('post', f'/datasets/{dsid}/upload', data=encoder,
+                                             headers={'Content-Type': encoder.content_type})
+                else:
+                    added_af = self._request('post', f'/datasets/{dsid}/upload', files=files)
                 return added_af
         else:
             try:
-                # use rclone to copy to bucket (using list args for security)
-                rclone_cmd = ['rclone', 'copy', file_path,
-                             'mf-cloud-storage-upload:/crucible-uploads/api-uploads/']
-                if verbose:
-                    print(f"uploading file {file_path}...")
-                    print(f"Running: {' '.join(rclone_cmd)}")
-                xx = run_shell(rclone_cmd)
-                if verbose:
-                    print(f"{xx.stdout=}")
-                    print(f"{xx.stderr=}")
-                    print(f"upload complete.")
-
-                # call add associated file
-                fname = os.path.basename(file_path)
-                af = {"filename": os.path.join("api-uploads", fname), 
-                     "size": os.path.getsize(file_path),
-                     "sha256_hash": checkhash(file_path)}
+                af = self._upload_large_file(file_path, size, verbose=verbose, chunked=route == 'chunked')
                 added_af = self._request('post', f"/datasets/{dsid}/associated_files", json=af)
                 return added_af[-1]
+            except Exception as err:
+                raise Exception(f"Files too large for transfer by http, and the bucket upload failed: {err}") from err
 
-            except:
-                raise Exception("Files too large for transfer by http")
+    def _upload_route(self, size: int) -> str:
+        """Pick how a file of `size` bytes is uploaded.
+
+        Returns:
+            str: 'multipart' for a single POST to the upload endpoint, 'chunked'
+                 for the parallel chunked upload, 'bucket' for a direct
+                 google-cloud-storage / rclone copy to the bucket
+        """
+        if size < self._MULTIPART_MAX_SIZE:
+            return 'multipart'
+        # chunks only go to servers that advertise the chunked upload endpoint
+        if size < self._chunked_max_size() and self._capability('chunked_upload'):
+            return 'chunked'
+        if size < self._UPLOAD_ENDPOINT_MAX_SIZE:
+            return 'multipart'
+        return 'bucket'
+
+    def _chunked_max_size(self) -> float:
+        """Largest file sent with the chunked upload, adapted to the measured upload speed."""
+        if self._upload_goodput is None:
+            return self._CHUNKED_MAX_SIZE
+        return min(max(self._upload_goodput * self._CHUNKED_MAX_SECONDS, 256 * 1024 ** 2), 16 * 1024 ** 3)
+
+    def _upload_large_file(self, file_path: str, size: int, file_hash: Optional[Future] = None, verbose=True,
+                           chunked: bool = True) -> Dict:
+        """Copy a large file to the upload bucket.
+
+        Args:
+            file_path (str): Local path to file to upload
+            size (int): Size of the file in bytes
+            file_hash (Future, optional): Pending checkhash of the file, used when
+                the transfer did not hash the file itself
+            chunked (bool): Try the chunked upload before the direct bucket copy
+
+        Returns:
+            Dict: Associated file record to add to the dataset (filename, size, sha256_hash)
+        """
+        sha256_hash = self._upload_to_bucket(file_path, size, verbose, chunked)
+        if verbose:
+            print(f"upload complete.")
+        if sha256_hash is not None:
+            if file_hash is not None:
+                file_hash.cancel()
+        elif file_hash is not None:
+            sha256_hash = file_hash.result()
+        else:
+            sha256_hash = checkhash(file_path)
+
+        fname = os.path.basename(file_path)
+        return {"filename": os.path.join(self._UPLOAD_PREFIX, fname), 
+                "size": size,
+                "sha256_hash": sha256_hash}
+
+    def _chunked_upload(self, file_path: str, dest: str, size: int,
+                        chunk_size: Optional[int] = None, parallel: Optional[int] = None):
+        """Upload a file to the upload bucket in parallel chunks over the API session.
+
+        Each chunk is sent as a PUT with a Content-Range header, so the session's
+        retry policy can resend a failed chunk on its own. The file is read once,
+        in order, and hashed as it is read; at most `parallel` chunks are held
+        in memory and in flight at once.
+
+        Args:
+            file_path (str): Local path to file to upload
+            dest (str): Object path within the upload bucket
+            size (int): Size of the file in bytes
+            chunk_size (int): Bytes per chunk (default: self.chunk_size, 16 MiB)
+            parallel (int): Maximum number of chunks in flight (default: self.chunk_parallel, 4)
+
+        Returns:
+            str: SHA256 hash of the file
+        """
+        chunk_size = chunk_size or self.chunk_size
+        parallel = parallel or self.chunk_parallel
+
+        def put_chunk(offset, chunk):
+            end = offset + len(chunk) - 1
+            headers = {'Content-Range': f'bytes {offset}-{end}/{size}',
+                       'Content-Type': 'application/octet-stream'}
+            # a chunk that still fails after the transport's own retries is
+            # sent again on its own instead of failing the whole transfer
+            for attempt in range(self._CHUNK_RETRIES + 1):
+                try:
+                    return self._request('put', f'/uploads/{dest}', data=chunk, timeout=300, headers=headers)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.HTTPError) as err:
+                    response = getattr(err, 'response', None)
+                    transient = response is None or response.status_code in (429, 500, 502, 503, 504)
+                    if not transient or attempt == self._CHUNK_RETRIES:
+                        raise
+                    time.sleep(2 ** attempt + random.uniform(0, 1))
+
+        sha256 = hashlib.sha256()
+        pending = set()
+        offset = 0
+        for chunk in hashing_file_iter(file_path, sha256, chunk_size):
+            if len(pending) >= parallel:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(self._executor.submit(put_chunk, offset, chunk))
+            offset += len(chunk)
+        if size == 0:
+            pending.add(self._executor.submit(put_chunk, 0, b''))
+        for future in pending:
+            future.result()
+        return sha256.hexdigest()
+
+    def _upload_to_bucket(self, file_path: str, size: int, verbose=True, chunked: bool = True):
+        """Copy a large file to the upload bucket.
+
+        Uses the API's chunked upload endpoint when the server advertises it
+        (falling back to the bucket copy if the connection fails), then a parallel chunked upload through google-cloud-storage when it is
+        installed and default credentials are available, and rclone otherwise
+        or when the google-cloud-storage upload fails.
+
+        Returns:
+            str: SHA256 hash of the file if the transfer computed it, else None
+        """
+        dest = f"{self._UPLOAD_PREFIX}/{os.path.basename(file_path)}"
+        if chunked and self._capability('chunked_upload'):
+            try:
+                if verbose:
+                    print(f"Uploading to {self._UPLOAD_BUCKET}/{dest} in chunks")
+                start = time.monotonic()
+                sha256_hash = self._chunked_upload(file_path, dest, size)
+                goodput = size / max(time.monotonic() - start, 1e-3)
+                if self._upload_goodput is None:
+                    self._upload_goodput = goodput
+                else:
+                    self._upload_goodput = 0.3 * goodput + 0.7 * self._upload_goodput
+                return sha256_hash
+            except requests.exceptions.ConnectionError:
+                pass
+
+        if gcs is not None:
+            try:
+                storage_client = gcs.Client()
+            except DefaultCredentialsError:
+                storage_client = None
+            if storage_client is not None:
+                if verbose:
+                    print(f"Uploading to gs://{self._UPLOAD_BUCKET}/{dest}")
+                blob = storage_client.bucket(self._UPLOAD_BUCKET).blob(dest)
+                try:
+                    transfer_manager.upload_chunks_concurrently(file_path, blob,
+                                                                chunk_size=16 * 1024 * 1024,
+                                                                max_workers=8)
+                    return None
+                except Exception as err:
+                    # e.g. these credentials cannot write to the bucket: the
+                    # configured rclone remote may still be able to
+                    print(f"WARNING: google-cloud-storage upload failed ({err}), falling back to rclone")
+
+        # use rclone to copy to bucket (using list args for security)
+        rclone_cmd = ['rclone', 'copy', file_path,
+                     f'mf-cloud-storage-upload:/{self._UPLOAD_BUCKET}/{self._UPLOAD_PREFIX}/']
+        if verbose:
+            print(f"Running: {' '.join(rclone_cmd)}")
+        xx = run_shell(rclone_cmd)
+        if verbose:
+            print(f"{xx.stdout=}")
+            print(f"{xx.stderr=}")
 
 
     def get_dataset_download_links(self, dsid: str):
@@ -250,7 +816,7 @@ class CrucibleClient:
                   and the value is the corresponding signed url. 
         """
 
-        result = self._request('get', f"/datasets/{dsid}/download_links")
+        result = self._disk_cached_get(f"/datasets/{dsid}/download_links", self._DOWNLOAD_LINKS_TTL)
         return result
 
     # TODO - maybe better to have specific functions like load_photo load_h5 load_json etc?
@@ -275,15 +841,118 @@ class CrucibleClient:
     #     return response.content()
 
 
-    def download_dataset(self, dsid: str, file_name: Optional[str] = None, output_dir: Optional[str] = 'crucible-downloads', overwrite_existing = True) -> None:
+    def _stream(self, url: str, **kwargs) -> requests.Response:
+        """Open a streamed GET of a signed url on the download pool.
+
+        Raises for error statuses before any of the body is read; the caller
+        must close the response (use it as a context manager).
+        """
+        response = self._download_session.get(url, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        # undo any content-encoding while copying from the raw stream
+        response.raw.decode_content = True
+        return response
+
+    def _download_one(self, fname: str, signed_url: str, output_dir: str, overwrite_existing: bool = True,
+                      chunk_size: int = DOWNLOAD_CHUNK_SIZE, sha256_hash: Optional[str] = None,
+                      size: Optional[int] = None) -> Optional[str]:
+        """Download a single file of a dataset from its signed url.
+
+        When sha256_hash is given, an existing local copy with the expected
+        size and hash is kept instead of downloaded again; otherwise the file
+        is hashed as it is written and removed again if it does not match.
+
+        Returns:
+            str or None: Local path of the file, None if an existing file was skipped
+        """
+        # set the local download location
+        download_path = os.path.join(output_dir, fname)
+
+        # check if the file exists and should be skipped
+        if overwrite_existing is False and os.path.exists(download_path):
+            return None
+
+        # skip files that are already there, comparing the size before hashing
+        if sha256_hash is not None and os.path.isfile(download_path):
+            if (size is None or os.path.getsize(download_path) == size) and checkhash(download_path) == sha256_hash:
+                return None
+
+        # if there are subdirectories make them now
+        os.makedirs(os.path.dirname(download_path), exist_ok=True)
+
+        # write to file, reserving the disk space up front when the size is
+        # known so the file is laid out in one go instead of grown chunk by chunk.
+        # a connection dropped mid-body is resumed with a Range request from the
+        # bytes already written, instead of failing the whole download
+        sha256 = hashlib.sha256() if sha256_hash is not None else None
+        written = resumes = 0
+        response = self._stream(signed_url)
+        try:
+            with open(download_path, 'wb') as f:
+                size = int(response.headers.get('Content-Length') or 0)
+                if size and hasattr(os, 'posix_fallocate'):
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, size)
+                    except OSError:
+                        pass
+                while True:
+                    try:
+                        for block in iter(partial(response.raw.read, chunk_size), b''):
+                            if sha256 is not None:
+                                sha256.update(block)
+                            f.write(block)
+                            written += len(block)
+                        break
+                    except (ProtocolError, ReadTimeoutError, requests.exceptions.ConnectionError):
+                        # encoded bodies cannot be resumed at a decoded offset
+                        if resumes >= self._DOWNLOAD_RESUMES or response.headers.get('Content-Encoding'):
+                            raise
+                        resumes += 1
+                        response.close()
+                        response = self._stream(signed_url, headers={'Range': f'bytes={written}-'})
+                        if response.status_code != 206:
+                            # range ignored: the full body is sent again
+                            f.seek(0)
+                            written = 0
+                            sha256 = hashlib.sha256() if sha256_hash is not None else None
+                f.truncate()
+        except BaseException:
+            # the space reserved up front would pass for a complete file:
+            # never leave a partial download behind
+            try:
+                os.remove(download_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            response.close()
+
+        if sha256_hash is not None and sha256.hexdigest() != sha256_hash:
+            os.remove(download_path)
+            raise ValueError(f"Checksum mismatch for {fname}: expected {sha256_hash}, got {sha256.hexdigest()}")
+        return download_path
+
+
+    def download_dataset(self, dsid: str, file_name: Optional[str] = None, output_dir: Optional[str] = 'crucible-downloads', overwrite_existing = True, use_regex: bool = False,
+                         chunk_size: int = DOWNLOAD_CHUNK_SIZE, verify: bool = False) -> None:
         """
         Download a dataset file.
 
         Args:
             dsid (str): Dataset Unique ID
             file_name (str, optional): File to download (If not provided, downloads all files)
+            use_regex (bool): Treat file_name as a regular expression matched against
+                              the full file paths instead of an exact file path (default: False)
             output_dir (str, optional): Directory to save files in (If not provided, files are saved to crucible-downloads/)
             overwrite_existing(bool): If the file already exists in the output directory, overwrite the File if set to True.
+            chunk_size (int): Bytes copied per read while writing each file (default: DOWNLOAD_CHUNK_SIZE, 1 MiB)
+            verify (bool): Check each file against the SHA256 hash of its associated file record,
+                           computed while it is written, and skip files already downloaded
+                           with the right contents (default: False)
         """
     
         # make sure the output directory is a directory not a file
@@ -292,38 +961,44 @@ class CrucibleClient:
         except:
             raise Exception("Please specify a directory for the output_dir")
         
+        # the hashes to verify against are fetched while the urls are signed
+        if verify:
+            records_future = self._executor.submit(self.get_associated_files, dsid, limit=1000)
+
         # generate the signed urls
         download_urls = self.get_dataset_download_links(dsid)
 
         # subset the urls to the file specified or all files if not specified
         if file_name is None:
             files = download_urls
+        elif use_regex:
+            file_regex = re.compile(file_name)
+            files = {k:v for k,v in download_urls.items() if file_regex.fullmatch(k)}
+        elif file_name in download_urls:
+            files = {file_name: download_urls[file_name]}
         else:
-            file_regex = fr"({file_name})"
-            files = {k:v for k,v in download_urls.items() if re.fullmatch(file_regex,k)}
-
-        downloads = []
-        for fname, signed_url in files.items():
-            
-            # set the local download location
-            download_path = os.path.join(output_dir, fname)
-
-            # check if the file exists and should be skipped
-            if overwrite_existing is False and os.path.exists(download_path):
-                continue
+            files = {}
+            if any(c in file_name for c in _REGEX_METACHARACTERS):
+                print(f"WARNING: no file named '{file_name}' in dataset {dsid}. "
+                      f"To match it as a regular expression, pass use_regex=True.")
 
-            # if there are subdirectories make them now
-            os.makedirs(os.path.dirname(download_path), exist_ok=True)
+        if not files:
+            return []
 
-            # get the content
-            response = requests.get(signed_url, stream=True)
+        hashes = {}
+        if verify:
+            records = records_future.result()
+            if len(download_urls) > 1000:
+                records = self.get_associated_files(dsid, limit=len(download_urls))
+            hashes = {af['filename']: (af.get('sha256_hash'), af.get('size')) for af in records}
 
-            # write to file
-            with open(download_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        # files are independent: fetch them concurrently
+        futures = [self._executor.submit(self._download_one, fname, signed_url, output_dir, overwrite_existing, chunk_size,
+                                         *hashes.get(fname, (None, None)))
+                   for fname, signed_url in files.items()]
+        downloads = [fut.result() for fut in futures]
 
-            downloads.append(download_path)
+        downloads = [download_path for download_path in downloads if download_path is not None]
 
         return(downloads)
         
@@ -369,48 +1044,91 @@ class CrucibleClient:
         return req_info
     
 
-    def get_request_status(self, dsid: str, reqid: str, request_type: str) -> Dict:
+    def get_request_status(self, dsid: str, reqid: str, request_type: str, wait: Optional[int] = None) -> Dict:
         """Get the status of any type of request.
 
         Args:
             dsid (str): Dataset ID
             reqid (str): Request ID
             request_type (str): Type of request ('ingest' or 'scicat_update')
+            wait (int, optional): Ask the server to hold the response for up to
+                                  this many seconds until the status changes (long poll)
 
         Returns:
             Dict: Request status information
         """
-        if request_type == 'ingest':
-            return self._request('get', f'/datasets/{dsid}/ingest/{reqid}')
-        elif request_type == 'scicat_update':
-            return self._request('get', f'/datasets/{dsid}/scicat_update/{reqid}')
-        else:
+        endpoint = self._STATUS_ENDPOINTS.get(request_type)
+        if endpoint is None:
             raise ValueError(f"Unsupported request_type: {request_type}")
+
+        kwargs = {}
+        if wait:
+            kwargs = {'params': {'wait': wait}, 'timeout': wait + 10}
+        return self._request('get', f'/datasets/{dsid}/{endpoint}/{reqid}', **kwargs)
     
 
     def _wait_for_request_completion(self, dsid: str, reqid: str, request_type: str,
-                                  sleep_interval: int = 5) -> Dict:
+                                  sleep_interval: float = 0.5, max_interval: float = 30,
+                                  long_poll: bool = False, backoff: float = 1.5,
+                                  max_attempts: Optional[int] = None) -> Dict:
         """Wait for a request to complete by polling its status.
 
+        The delay between status checks starts at sleep_interval and grows by
+        a factor of backoff after every check (with a little jitter) up to
+        max_interval, so short requests return quickly and long ones are not
+        polled needlessly.
+
         Args:
             dsid (str): Dataset ID
             reqid (str): Request ID
             request_type (str): Type of request ('ingest' or 'scicat_update')
-            sleep_interval (int): Seconds between status checks
+            sleep_interval (float): Seconds before the first status check
+            max_interval (float): Maximum seconds between status checks
+            long_poll (bool): Let the server hold each status request until
+                              the status changes (up to 25 seconds)
+            backoff (float): Growth factor of the delay between status checks
+            max_attempts (int, optional): Give up after this many status checks (default: wait indefinitely)
 
         Returns:
             Dict: Final request status information
+
+        Raises:
+            TimeoutError: If the request is still pending after max_attempts status checks
         """
+        wait = 25 if long_poll else None
         req_info = self.get_request_status(dsid, reqid, request_type)
         print(f"Waiting for {request_type} request to complete...")
 
+        delay = sleep_interval
+        attempts = 1
         while req_info['status'] in ['requested', 'started']:
-            time.sleep(sleep_interval)
-            req_info = self.get_request_status(dsid, reqid, request_type)
+            if max_attempts is not None and attempts >= max_attempts:
+                raise TimeoutError(f"{request_type} request {reqid} still {req_info['status']} after {attempts} status checks")
+            attempts += 1
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(delay * backoff, max_interval)
+            req_info = self.get_request_status(dsid, reqid, request_type, wait=wait)
             print(f"Current status: {req_info['status']}")
 
         print(f"Request completed with status: {req_info['status']}")
         return req_info
+
+    def wait_for_requests(self, requests_to_wait: List[Tuple[str, str, str]],
+                          max_concurrency: int = 16) -> List[Dict]:
+        """Wait for several requests to complete, polling them concurrently.
+
+        Args:
+            requests_to_wait (List[Tuple[str, str, str]]): (dsid, reqid, request_type) of each request
+            max_concurrency (int): Maximum number of requests polled at once (default: 16)
+
+        Returns:
+            List[Dict]: Final request status information, in the same order
+        """
+        # own pool: polling sleeps between checks and must not hold up the shared executor
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = [pool.submit(self._wait_for_request_completion, dsid, reqid, request_type)
+                       for dsid, reqid, request_type in requests_to_wait]
+            return [future.result() for future in futures]
     
 
     def get_dataset_access_groups(self, dsid: str) -> List[str]:
@@ -438,8 +1156,7 @@ class CrucibleClient:
         Returns:
             Dict: Scientific metadata containing experimental parameters and settings
         """
-        return self._request('get', f'/datasets/{dsid}/scientific_metadata')
-
+        return self._disk_cached_get(f'/datasets/{dsid}/scientific_metadata', self._METADATA_TTL)
 
     def update_scientific_metadata(self, dsid: str, metadata: Dict, overwrite = False) -> Dict:
         """Create or replace scientific metadata for a dataset.
@@ -451,6 +1168,8 @@ class CrucibleClient:
         Returns:
             Dict: Updated metadata object
         """
+        self._disk_cache_delete(f'/datasets/{dsid}/scientific_metadata')
+
         if overwrite == True:
             return self._request('post', f'/datasets/{dsid}/scientific_metadata', json=metadata)
         else: 
@@ -466,7 +1185,7 @@ class CrucibleClient:
         Returns:
             List[Dict]: Thumbnail objects with base64-encoded images
         """
-        return self._request('get', f'/datasets/{dsid}/thumbnails')
+        return self._request('get', f'/datasets/{dsid}/thumbnails', params={'limit': limit})
 
 
     def add_thumbnail(self, dsid: str, file_path: str, thumbnail_name: str = None) -> Dict:
@@ -480,12 +1199,15 @@ class CrucibleClient:
         Returns:
             Dict: Created thumbnail object
         """
-        import base64
-
-        # Read file and encode to base64
+        # Read file and encode to base64 chunk by chunk, so the raw file is
+        # never held in memory next to its encoding. Chunks are a multiple
+        # of 3 bytes, which makes the concatenated pieces a valid encoding.
+        # pybase64 (SIMD) is used when installed.
+        encoded = bytearray()
         with open(file_path, 'rb') as f:
-            file_content = f.read()
-            thumbnail_b64str = base64.b64encode(file_content).decode('utf-8')
+            for chunk in iter(partial(f.read, 57 * 1024), b''):
+                encoded += _b64encode(chunk)
+        thumbnail_b64str = encoded.decode('utf-8')
 
         # Use filename if no thumbnail_name provided
         if thumbnail_name is None:
@@ -508,7 +1230,7 @@ class CrucibleClient:
         Returns:
             List[Dict]: File metadata with names, sizes, and hashes
         """
-        return self._request('get', f'/datasets/{dsid}/associated_files')
+        return self._request('get', f'/datasets/{dsid}/associated_files', params={'limit': limit})
 
 
     def add_associated_file(self, dsid: str, file_path: str, filename: str = None) -> Dict:
@@ -523,8 +1245,7 @@ class CrucibleClient:
             Dict: Created associated file object
         """
         # Calculate file metadata
-        file_size = os.path.getsize(file_path)
-        file_hash = checkhash(file_path)
+        file_size, file_hash = stat_and_hash(file_path)
 
         # Use basename if no filename provided
         if filename is None:
@@ -536,6 +1257,31 @@ class CrucibleClient:
             'sha256_hash': file_hash
         }
         return self._request('post', f'/datasets/{dsid}/associated_files', json=associated_file_data)
+
+    def add_associated_files_bulk(self, dsid: str, associated_files: List[Dict]) -> List[Dict]:
+        """Add several associated file records to a dataset.
+
+        Uses the batch endpoint in a single request when the server advertises
+        it, and concurrent single-file requests otherwise.
+
+        Args:
+            dsid (str): Dataset ID
+            associated_files (List[Dict]): Records with filename, size and sha256_hash
+
+        Returns:
+            List[Dict]: Created associated file objects
+        """
+        associated_files = list(associated_files)
+        if not associated_files:
+            return []
+
+        if self._capability('bulk_associated_files'):
+            return self._request('post', f'/datasets/{dsid}/associated_files:batch',
+                                 json={'associated_files': associated_files})
+
+        def add_one(af):
+            return self._request('post', f'/datasets/{dsid}/associated_files', json=af)[-1]
+        return list(self._executor.map(add_one, associated_files))
     
 
     def get_keywords(self, dsid: str = None, limit: int = 100) -> List[Dict]:
@@ -547,10 +1293,11 @@ class CrucibleClient:
         Returns:
             List[Dict]: Keyword objects with keyword text and num_datasets counts
         """
+        params = {'limit': limit}
         if dsid is None:
-            return self._request('get', '/keywords')
+            return self._request('get', '/keywords', params=params)
         else:
-            return self._request('get', f'/datasets/{dsid}/keywords')
+            return self._request('get', f'/datasets/{dsid}/keywords', params=params)
 
 
     def add_dataset_keyword(self, dsid: str, keyword: str) -> Dict:
@@ -566,6 +1313,30 @@ class CrucibleClient:
         return self._request('post', f'/datasets/{dsid}/keywords', params={'keyword': keyword})
 
 
+    def add_dataset_keywords_bulk(self, dsid: str, keywords: List[str]) -> List[Dict]:
+        """Add several keywords to a dataset.
+
+        Uses the batch endpoint in a single request when the server advertises
+        it, and concurrent single-keyword requests otherwise.
+
+        Args:
+            dsid (str): Dataset ID
+            keywords (List[str]): Keywords/tags to associate with dataset
+
+        Returns:
+            List[Dict]: Keyword objects with updated usage counts
+        """
+        keywords = list(keywords)
+        if not keywords:
+            return []
+
+        if self._capability('bulk_keywords'):
+            return self._request('post', f'/datasets/{dsid}/keywords:batch', json={'keywords': keywords})
+
+        add_keyword = partial(self.add_dataset_keyword, dsid)
+        return list(self._executor.map(add_keyword, keywords))
+
+
     def delete_dataset(self, dsid: str) -> Dict:
         """Delete a dataset (not implemented in API).
 
@@ -601,6 +1372,25 @@ class CrucibleClient:
         pass
 
 
+    def _update_request_status(self, request_type: str, dsid: str, reqid: str, status: str, timezone: str):
+        """PATCH the status of a request, stamping the completion time when it is complete.
+
+        Returns:
+            requests.Response: HTTP response from the update request (an
+                               httpx.Response on the httpx transport)
+        """
+        patch_json = {"id": reqid, "status": status}
+        if status == "complete":
+            patch_json["time_completed"] = get_tz_isoformat(timezone)
+
+        url = f"{self._base}datasets/{dsid}/{request_type}/{reqid}"
+        kwargs = _encode_json({'json': patch_json, 'timeout': 10})
+        if self._http is not None:
+            if isinstance(kwargs.get('data'), bytes):
+                kwargs['content'] = kwargs.pop('data')
+            return self._http.patch(url, **kwargs)
+        return self.session.patch(url, **kwargs)
+
     def update_ingestion_status(self, dsid: str, reqid: str, status: str, timezone: str = "America/Los_Angeles"):
         """Update the status of a dataset ingestion request.
 
@@ -615,18 +1405,7 @@ class CrucibleClient:
         Returns:
             requests.Response: HTTP response from the update request
         """
-        if status == "complete":
-            completion_time = get_tz_isoformat(timezone)
-            patch_json = {"id": reqid,
-                        "status": status,
-                        "time_completed": completion_time}
-        else:
-            patch_json = {"id": reqid,
-                        "status": status}
-
-        url = f"{self.api_url}/datasets/{dsid}/ingest/{reqid}"
-        response = requests.request("patch", url, json=patch_json, headers=self.headers)
-        return response
+        return self._update_request_status('ingest', dsid, reqid, status, timezone)
 
 
     def update_scicat_upload_status(self, dsid: str, reqid: str, status: str, timezone: str = "America/Los_Angeles"):
@@ -643,18 +1422,7 @@ class CrucibleClient:
         Returns:
             requests.Response: HTTP response from the update request
         """
-        if status == "complete":
-            completion_time = get_tz_isoformat(timezone)
-            patch_json = {"id": reqid,
-                        "status": status,
-                        "time_completed": completion_time}
-        else:
-            patch_json = {"id": reqid,
-                        "status": status}
-
-        url = f"{self.api_url}/datasets/{dsid}/scicat_update/{reqid}"
-        response = requests.request("patch", url, json=patch_json, headers=self.headers)
-        return response
+        return self._update_request_status('scicat_update', dsid, reqid, status, timezone)
 
 
     def update_transfer_status(self, dsid: str, reqid: str, status: str, timezone: str = "America/Los_Angeles"):
@@ -671,18 +1439,7 @@ class CrucibleClient:
         Returns:
             requests.Response: HTTP response from the update request
         """
-        if status == "complete":
-            completion_time = get_tz_isoformat(timezone)
-            patch_json = {"id": reqid,
-                        "status": status,
-                        "time_completed": completion_time}
-        else:
-            patch_json = {"id": reqid,
-                        "status": status}
-
-        url = f"{self.api_url}/datasets/{dsid}/google_drive_transfer/{reqid}"
-        response = requests.request("patch", url, json=patch_json, headers=self.headers)
-        return response
+        return self._update_request_status('google_drive_transfer', dsid, reqid, status, timezone)
 
 
     def list_instruments(self, limit: int = 100) -> List[Dict]:
@@ -694,7 +1451,7 @@ class CrucibleClient:
         Returns:
             List[Dict]: Instrument objects with specifications and metadata
         """
-        result = self._request('get', '/instruments')
+        result = self._request('get', '/instruments', params={'limit': limit})
         return result
 
 
@@ -720,7 +1477,7 @@ class CrucibleClient:
         else:
             params = {"instrument_name": instrument_name}
 
-        found_inst = self._request('get', '/instruments', params=params)
+        found_inst = self._disk_cached_get('/instruments', self._METADATA_TTL, params=params)
 
         if len(found_inst) > 0:
             return found_inst[-1]
@@ -728,6 +1485,19 @@ class CrucibleClient:
             return None
 
 
+    def prewarm_instruments(self, limit: int = 1000) -> Dict[str, Dict]:
+        """Load the instrument listing once, so get_or_add_instrument can resolve
+        known instruments without a request each.
+
+        Args:
+            limit (int): Maximum number of instruments to load (default: 1000)
+
+        Returns:
+            Dict[str, Dict]: Instruments keyed by name
+        """
+        self._instruments_by_name = {inst['instrument_name']: inst for inst in self.list_instruments(limit=limit) or []}
+        return self._instruments_by_name
+
     def get_or_add_instrument(self, instrument_name: str, location: str = None, instrument_owner: str = None) -> Dict:
         """Get an existing instrument or create a new one if it doesn't exist.
 
@@ -739,7 +1509,17 @@ class CrucibleClient:
         Returns:
             Dict: Instrument information (existing or newly created)
         """
-        found_inst = self.get_instrument(instrument_name)
+        if self.cache:
+            # one listing per client instead of a lookup per call
+            if self._instruments_by_name is None:
+                self.prewarm_instruments()
+            found_inst = self._instruments_by_name.get(instrument_name)
+        else:
+            found_inst = None
+
+        if not found_inst:
+            # not in the (possibly truncated) listing: check before creating a duplicate
+            found_inst = self.get_instrument(instrument_name)
 
         if found_inst:
             return found_inst
@@ -751,6 +1531,12 @@ class CrucibleClient:
                         "owner": instrument_owner}
             print(new_instrum)
             instrument = self._request('post', '/instruments', json=new_instrum)
+            instruments_by_name = self._instruments_by_name
+            self.invalidate_cache('get_instrument', 'list_instruments')
+            if instruments_by_name is not None and isinstance(instrument, dict):
+                # keep the loaded listing, it only lacks the new instrument
+                instruments_by_name[instrument_name] = instrument
+                self._instruments_by_name = instruments_by_name
         return instrument
 
 
@@ -767,7 +1553,6 @@ class CrucibleClient:
         return response
 
     def list_parents_of_sample(self, sample_id, limit = 100, **kwargs)-> List[Dict]:
-        params = {**kwargs}
         """List the parents of a given sample with optional filtering.
 
         Args:
@@ -778,12 +1563,13 @@ class CrucibleClient:
         Returns:
             List[Dict]: Parent samples
         """
+        params = {**kwargs}
+        params['limit'] = limit
         result = self._request('get', f"/samples/{sample_id}/parents", params=params)
         return result
     
 
     def list_children_of_sample(self, sample_id, limit = 100, **kwargs)-> List[Dict]:
-        params = {**kwargs}
         """List the children of a given sample with optional filtering.
 
         Args:
@@ -794,6 +1580,8 @@ class CrucibleClient:
         Returns:
             List[Dict]: Children samples
         """
+        params = {**kwargs}
+        params['limit'] = limit
         result = self._request('get', f"/samples/{sample_id}/children", params=params)
         return result
     
@@ -811,6 +1599,7 @@ class CrucibleClient:
             List[Dict]: Sample information
         """
         params = {**kwargs}
+        params['limit'] = limit
         if dataset_id:
             result = self._request('get', f"/datasets/{dataset_id}/samples", params=params)
         elif parent_id:
@@ -831,42 +1620,74 @@ class CrucibleClient:
         Returns:
             Dict: Created link object
         """
-        return self._request('post', f"/samples/{parent_id}/children/{child_id}")
+        new_link = self._request('post', f"/samples/{parent_id}/children/{child_id}")
+        self.invalidate_cache('get_sample')
+        return new_link
+
+
+    def link_samples_bulk(self, links: List[Tuple[str, str]]) -> List[Dict]:
+        """Link several pairs of samples with parent-child relationships.
+
+        Uses the batch endpoint in a single request when the server advertises
+        it, and one request per link, sent concurrently, otherwise.
+
+        Args:
+            links (List[Tuple[str, str]]): (parent_id, child_id) pairs of unique sample identifiers
+
+        Returns:
+            List[Dict]: Created link objects
+        """
+        links = list(links)
+        if not links:
+            return []
+
+        if self._capability('bulk_links'):
+            payload = [{"parent_id": parent_id, "child_id": child_id} for parent_id, child_id in links]
+            result = self._request('post', '/samples/links:batch', json=payload)
+        else:
+            result = self._post_sample_links(links)
+
+        self.invalidate_cache('get_sample')
+        return result
+
+
+    def _post_sample_links(self, links: List[Tuple[str, str]]) -> List[Dict]:
+        """Create several parent-child sample links concurrently.
+
+        Args:
+            links (List[tuple]): (parent_id, child_id) pairs
+
+        Returns:
+            List[Dict]: Created link objects, in the order of links
+        """
+        if not links:
+            return []
+
+        def post_link(link):
+            parent_id, child_id = link
+            return self._request('post', f"/samples/{parent_id}/children/{child_id}")
+
+        return list(self._executor.map(post_link, links))
 
 
     def update_sample(self, unique_id: str = None, sample_name: str = None, description: str = None,
                    creation_date: str = None, owner_orcid: str = None, owner_id: int = None, project_id: str = None, sample_type: str = None,
-                   parents: List[Dict] = [], children: List[Dict] = []):
-        
-        sample_info = {   "unique_id": unique_id,
-                          "sample_name": sample_name,
-                          "owner_orcid": owner_orcid,
-                          "owner_user_id": owner_id,
-                          "sample_type": sample_type,
-                          "description": description,
-                          "project_id": project_id,
-                          "date_created": creation_date
-                        }
-
-        sample_info = {k:v for k,v in sample_info.items() if v is not None}
-    
+                   parents: Optional[List[Dict]] = None, children: Optional[List[Dict]] = None):
+        sample_info = _sample_info(unique_id, sample_name, sample_type, owner_orcid, owner_id,
+                                   description, project_id, creation_date)
         upd_samp = self._request('patch', f"/samples/{unique_id}", json=sample_info)
-        for p in parents:
-            parent_id = p['unique_id']
-            child_id = upd_samp['unique_id']
-            self._request('post', f"/samples/{parent_id}/children/{child_id}")
-
-        for chd in children:
-            parent_id = upd_samp['unique_id']
-            child_id = chd['unique_id']
-            self._request('post', f"/samples/{parent_id}/children/{child_id}")
+        sample_id = upd_samp['unique_id']
+        links = [(p['unique_id'], sample_id) for p in parents or ()]
+        links += [(sample_id, chd['unique_id']) for chd in children or ()]
+        self.link_samples_bulk(links)
 
+        self.invalidate_cache('get_sample')
         return upd_samp
 
 
     def add_sample(self, unique_id: str = None, sample_name: str = None, description: str = None,
                    creation_date: str = None, owner_orcid: str = None, owner_id: int = None, project_id: str = None, sample_type: str = None,
-                   parents: List[Dict] = [], children: List[Dict] = []) -> Dict:
+                   parents: Optional[List[Dict]] = None, children: Optional[List[Dict]] = None) -> Dict:
         """Add a new sample with optional parent-child relationships.
 
         Args:
@@ -884,30 +1705,19 @@ class CrucibleClient:
         Returns:
             Dict: Created sample object
         """
-        sample_info = {   "unique_id": unique_id,
-                          "sample_name": sample_name,
-                          "sample_type": sample_type,
-                          "owner_orcid": owner_orcid,
-                          "owner_user_id": owner_id,
-                          "description": description,
-                          "project_id": project_id,
-                          "date_created": creation_date
-                        }
+        sample_info = _sample_info(unique_id, sample_name, sample_type, owner_orcid, owner_id,
+                                   description, project_id, creation_date)
         if unique_id is None and sample_name is None:
             raise Exception('Please provide either a unique ID or a sample name for your sample')
             
         new_samp = self._request('post', "/samples", json=sample_info)
 
-        for p in parents:
-            parent_id = p['unique_id']
-            child_id = new_samp['unique_id']
-            self._request('post', f"/samples/{parent_id}/children/{child_id}")
-
-        for chd in children:
-            parent_id = new_samp['unique_id']
-            child_id = chd['unique_id']
-            self._request('post', f"/samples/{parent_id}/children/{child_id}")
+        sample_id = new_samp['unique_id']
+        links = [(p['unique_id'], sample_id) for p in parents or ()]
+        links += [(sample_id, chd['unique_id']) for chd in children or ()]
+        self.link_samples_bulk(links)
 
+        self.invalidate_cache('get_sample')
         return new_samp
     
     def remove_sample_from_dataset(self, dataset_id: str, sample_id: str) -> Dict:
@@ -917,6 +1727,7 @@ class CrucibleClient:
         Currently only available in staging API
         '''
         del_link = self._request('delete', f"/datasets/{dataset_id}/samples/{sample_id}")
+        self.invalidate_cache('get_sample')
         return del_link
     
 
@@ -931,6 +1742,7 @@ class CrucibleClient:
             Dict: Information about the created link
         """
         new_link = self._request('post', f"/datasets/{dataset_id}/samples/{sample_id}")
+        self.invalidate_cache('get_sample')
         return new_link
 
     add_dataset_to_sample = add_sample_to_dataset
@@ -952,12 +1764,14 @@ class CrucibleClient:
         new_user = self._request('post', "/users",
                                 json={"user_info": user_info,
                                       "project_ids": user_projects})
+        self.invalidate_cache('get_user')
         return new_user
 
 
     def add_user_to_project(self, orcid, project_id):
         updated_project_users = self._request('post', f'/projects/{project_id}/users/{orcid}')
-        
+        self.invalidate_cache('get_user', 'get_project')
+        self._disk_cache_delete(f'/projects/{project_id}')
         return updated_project_users
         
         
@@ -996,12 +1810,8 @@ class CrucibleClient:
     
 
     def check_small_files(self, filelist):
-        for f in filelist:
-            if os.path.getsize(f) < 1e8:
-                continue
-            else:
-                return False
-        return True
+        """Whether all files are small enough (< 100 MB) for the upload endpoint."""
+        return all(os.stat(f).st_size < 100_000_000 for f in filelist)
 
 
     def get_or_add_project(self, project_id, get_project_info_function = _build_project_from_args, **kwargs):
@@ -1028,22 +1838,21 @@ class CrucibleClient:
             
         if project_info:
             proj = self._request('post', "/projects", json=project_info)
+            self.invalidate_cache('get_project')
+            self._disk_cache_delete(f'/projects/{project_id}')
             return proj
         else:
             raise ValueError(f"Project info for {project_id} not found in database or using the provided get_project_info_func")
         
 
-    def create_new_dataset(self,
-                            dataset: BaseDataset, 
-                            scientific_metadata: Optional[dict] = {}, 
-                            keywords: List[str] = [],
-                            get_user_info_function = None,
-                            verbose = False) -> Dict:
-        
-        """Shared helper method to create a dataset with metadata."""
-        
-        dataset_details = dict(**dataset.model_dump())
-        
+    def _prepare_dataset_record(self, dataset: BaseDataset, get_user_info_function = None) -> Dict:
+        """Resolve the owner, project and instrument of a dataset into the record to post.
+
+        Returns:
+            Dict: Dataset fields with owner_user_id and instrument_id filled in, without empty fields
+        """
+        dataset_details = dataset.model_dump(exclude_none=True)
+
         # add creation time
         if dataset_details.get('creation_time') is None:
             dataset_details['creation_time'] = get_tz_isoformat()
@@ -1074,38 +1883,94 @@ class CrucibleClient:
             else:
                 raise ValueError(f'Provided instrument does not exist: {instrument_name}')
 
+        return dataset_details
+
+
+    def create_new_dataset(self,
+                            dataset: BaseDataset, 
+                            scientific_metadata: Optional[dict] = {}, 
+                            keywords: Optional[List[str]] = None,
+                            get_user_info_function = None,
+                            verbose = False) -> Dict:
+        
+        """Shared helper method to create a dataset with metadata."""
+        clean_dataset = self._prepare_dataset_record(dataset, get_user_info_function)
+
         if verbose:
             print('creating new dataset record...')
-            
-        clean_dataset = {k: v for k, v in dataset_details.items() if v is not None}
+
+        # record, metadata and keywords in one transaction if the server advertises it
+        if self._capability('atomic_create'):
+            created = self._request('post', '/datasets:createWithMetadata',
+                                    json={"dataset": clean_dataset,
+                                          "scientific_metadata": scientific_metadata,
+                                          "keywords": keywords or []})
+            dsid = created['dataset']['unique_id']
+            print(f"{dsid=}")
+            return {"created_record": created['dataset'],
+                    "scientific_metadata_record": created.get('scientific_metadata'),
+                    "dsid": dsid}
+
         print(f'[pycrucible] post request to /datasets... with {clean_dataset}')
         new_ds_record = self._request('post', '/datasets', json = clean_dataset)
         print(f'[pycrucible] request_complete')
         dsid = new_ds_record['unique_id']
         
-        # add scientific metadata
-        scimd = None
+        # add scientific metadata and keywords concurrently, both only need the dsid
+        scimd = scimd_future = None
         if scientific_metadata is not None:
             if verbose:
                 print(f'adding scientific metadata record for {dsid}')
-            scimd = self._request('post', f'/datasets/{dsid}/scientific_metadata', json=scientific_metadata)
+            scimd_future = self._executor.submit(self._request, 'post', f'/datasets/{dsid}/scientific_metadata',
+                                                 json=scientific_metadata)
+
+        # add keywords; the keyword fallback fans out on the executor itself,
+        # so it runs in this thread rather than as a task on the pool
+        try:
+            if keywords:
+                if verbose:
+                    print(f'adding keywords to dataset {dsid}: {keywords}')
+                self.add_dataset_keywords_bulk(dsid, keywords)
+        finally:
+            # never leave the metadata post running behind a failed keyword call
+            if scimd_future is not None:
+                wait([scimd_future])
+
+        if scimd_future is not None:
+            scimd = scimd_future.result()
             if verbose:
                 print('metadata addition complete')
-                print(f'adding keywords to dataset {dsid}: {keywords}')
-
-        # add keywords
-        for kw in keywords:
-            self.add_dataset_keyword(dsid, kw)
 
         print(f"{dsid=}")
         return {"created_record": new_ds_record, "scientific_metadata_record": scimd, "dsid": dsid}
 
     
+    def _dataset_for_upload(self, dataset: BaseDataset, files_to_upload: List[str]):
+        """Point the dataset's file_to_upload at the uploaded copy of its main file.
+
+        Returns:
+            tuple: (dataset with the cloud file_to_upload, cloud path of the main file)
+        """
+        # figure out the file path
+        print(f'{files_to_upload=}')
+        main_file = dataset.file_to_upload
+        print(f'from dataset_details: {main_file=}')
+        if not main_file:
+            main_file = files_to_upload[0]
+            print(f'from files_to_upload: {main_file=}')
+        base_file_name = os.path.basename(main_file)
+        print(f'{base_file_name=}')
+        main_file_cloud = os.path.join(f'{self._UPLOAD_PREFIX}/{base_file_name}')
+        print(f'{main_file_cloud=}')
+        # shallow copy, the fields were already validated
+        return dataset.model_copy(update={'file_to_upload': main_file_cloud}), main_file_cloud
+
+
     def create_new_dataset_from_files(self, 
                                      dataset: BaseDataset, 
                                      files_to_upload: List[str], 
                                      scientific_metadata: Optional[dict] = None,
-                                     keywords: List[str] = [], 
+                                     keywords: Optional[List[str]] = None, 
                                      get_user_info_function = None, 
                                      ingestor = 'ApiUploadIngestor',
                                      verbose = False,
@@ -1158,22 +2023,16 @@ class CrucibleClient:
         Raises:
             ValueError: If project_id is provided but the project does not exist in the database
         """
-        # figure out the file path
-        dataset_details = dict(**dataset.model_dump())
-        
-        print(f'{files_to_upload=}')
-        main_file = dataset_details.get('file_to_upload') 
-        print(f'from dataset_details: {main_file=}')
-        if not main_file:
-            main_file = files_to_upload[0]
-            print(f'from files_to_upload: {main_file=}')
-        base_file_name = os.path.basename(main_file)
-        print(f'{base_file_name=}')
-        main_file_cloud = os.path.join(f'api-uploads/{base_file_name}')
-        dataset_details['file_to_upload'] = main_file_cloud
-        print(f'{main_file_cloud=}')
+        cleaned_dataset, main_file_cloud = self._dataset_for_upload(dataset, files_to_upload)
+        sizes = [os.stat(f).st_size for f in files_to_upload]
+        routes = [self._upload_route(size) for size in sizes]
+        # the chunked upload hashes files as it sends them; for direct bucket
+        # copies, start hashing now, so it overlaps with creating the record
+        # and with uploading the files ahead of them
+        file_hashes = [self._hash_executor.submit(checkhash, f) if route == 'bucket' else None
+                       for f, route in zip(files_to_upload, routes)]
+
         # create the dataset record / user / scimd / instrument / project
-        cleaned_dataset = BaseDataset(**dataset_details)
         result = self.create_new_dataset(cleaned_dataset, 
                                          scientific_metadata=scientific_metadata,
                                          keywords=keywords,
@@ -1185,7 +2044,26 @@ class CrucibleClient:
         dsid = result["dsid"]
             
         # Upload the files and add to dataset -- returns list of associated file objs (filename, size, sha)
-        uploaded_files = [self.upload_dataset_file(dsid, each_file, verbose) for each_file in files_to_upload]
+        # files sent in a single POST go through the upload endpoint concurrently;
+        # larger ones already use a parallel transfer each and are sent one at a
+        # time, then registered together once they are all in the bucket
+        uploaded_files = [None] * len(files_to_upload)
+        multipart = [i for i, route in enumerate(routes) if route == 'multipart']
+        upload = partial(self.upload_dataset_file, dsid, verbose=verbose, _route='multipart')
+        multipart_uploads = self._executor.map(upload, [files_to_upload[i] for i in multipart])
+
+        large_files = {}
+        for i, (each_file, size, route, file_hash) in enumerate(zip(files_to_upload, sizes, routes, file_hashes)):
+            if route != 'multipart':
+                if verbose:
+                    print(f"uploading file {each_file}...")
+                large_files[i] = self._upload_large_file(each_file, size, file_hash, verbose,
+                                                         chunked=route == 'chunked')
+        added = self.add_associated_files_bulk(dsid, list(large_files.values()))
+        for i, af in zip(large_files, added):
+            uploaded_files[i] = af
+        for i, af in zip(multipart, multipart_uploads):
+            uploaded_files[i] = af
 
         if verbose:
             print(f"submitting {dsid} to be ingested from file {main_file_cloud} using the class {ingestor}")
@@ -1217,7 +2095,6 @@ class CrucibleClient:
         return new_link
     
     def list_children_of_dataset(self, parent_dataset_id: str, limit = 100, **kwargs) -> List[Dict]:
-        params = {**kwargs}
         """List the children of a given dataset with optional filtering.
 
         Args:
@@ -1228,8 +2105,8 @@ class CrucibleClient:
         Returns:
             List[Dict]: Children datasets
         """
-        params = {**kwargs}
-        result = self._request('get', f"/datasets/{parent_dataset_id}/children", params=params)
+        kwargs.setdefault('limit', limit)
+        result = self._request('get', f"/datasets/{parent_dataset_id}/children", params=kwargs)
         return result
 
 
@@ -1243,8 +2120,8 @@ class CrucibleClient:
         Returns:
             List[Dict]: Parent datasets
         """
-        params = {**kwargs}
-        result = self._request('get', f"/datasets/{child_dataset_id}/parents", params=params)
+        kwargs.setdefault('limit', limit)
+        result = self._request('get', f"/datasets/{child_dataset_id}/parents", params=kwargs)
         return result
     
 
@@ -1,7 +1,9 @@
+import os
 import subprocess as sp
 import hashlib
 import pytz
 from datetime import datetime
+from functools import lru_cache
 
 def run_shell(cmd, checkflag = True, background = False):
     """Execute a shell command and return the result.
@@ -46,10 +48,64 @@ def checkhash(file):
         str: Hexadecimal SHA256 hash of the file
     """
     with open(file,"rb") as f:
-        fdata = f.read() 
-        readable_hash = hashlib.sha256(fdata).hexdigest()
+        readable_hash = _sha256_of(f)
     return(readable_hash)
 
+
+def stat_and_hash(file):
+    """Get the size and SHA256 hash of a file, both from the same open handle.
+
+    Args:
+        file (str): Path to the file
+
+    Returns:
+        tuple: (size in bytes, hexadecimal SHA256 hash)
+    """
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        return size, _sha256_of(f)
+
+
+def _sha256_of(f):
+    """Hexadecimal SHA256 hash of the rest of a binary file object."""
+    if hasattr(hashlib, "file_digest"):
+        # python >= 3.11: a readinto loop over one reused 256 KiB buffer, so no
+        # chunk is allocated per read; the loop itself is Python, only update()
+        # releases the GIL while it hashes
+        return hashlib.file_digest(f, "sha256").hexdigest()
+    sha256 = hashlib.sha256()
+    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def hashing_file_iter(file, hasher, chunk_size = 1024 * 1024):
+    """Read a file in blocks, feeding each block to a hash before yielding it.
+
+    Lets a file be hashed in the same pass that sends it, e.g.
+
+        sha256 = hashlib.sha256()
+        for block in hashing_file_iter(path, sha256):
+            send(block)
+        sha256.hexdigest()
+
+    Args:
+        file (str): Path to the file to read
+        hasher: hashlib object updated with every block
+        chunk_size (int): Bytes per block. Defaults to 1 MiB.
+
+    Yields:
+        bytes: Consecutive blocks of the file
+    """
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(block)
+            yield block
+
+
+# pytz.timezone normalizes and validates the name on every call
+_timezone = lru_cache(maxsize=8)(pytz.timezone)
+
     
 def get_tz_isoformat(timezone = "America/Los_Angeles"):
     """Get current time in ISO format for a specific timezone.
@@ -60,7 +116,7 @@ def get_tz_isoformat(timezone = "America/Los_Angeles"):
     Returns:
         str: Current time in ISO format for the specified timezone
     """
-    pst= pytz.timezone(timezone)
+    pst= _timezone(timezone)
     curr_pct_time = datetime.now(pst).isoformat()
     return(curr_pct_time)
 
@@ -19,6 +19,8 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "requests>=2.25.0",
+        "urllib3>=1.26",
+        "requests-toolbelt>=0.9",
         "pytz>=2021.1",
         "ipywidgets",
         "pydantic",
@@ -33,6 +35,16 @@ setup(
             "flake8>=3.8",
             "mypy>=0.812",
         ],
+        "async": [
+            "httpx[http2]>=0.23",
+        ],
+        "fast": [
+            "orjson>=3.6",
+            "pybase64>=1.0",
+        ],
+        "gcs": [
+            "google-cloud-storage>=2.10",
+        ],
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,83 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from pycrucible.pycrucible import CrucibleClient, httpx
+
+if httpx is not None:
+    from pycrucible.async_client import AsyncCrucibleClient
+
+RESPONSES = {
+    '/api/v1/json': (200, 'application/json', json.dumps({'unique_id': 'ds1'}).encode()),
+    '/api/v1/text': (200, 'text/plain', b'plain text'),
+    '/api/v1/broken-json': (200, 'application/json', b'{not json'),
+    '/api/v1/empty': (204, None, b''),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        status, content_type, body = RESPONSES[self.path]
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if status != 204:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class TestAsyncRequest(unittest.IsolatedAsyncioTestCase):
+    """The async client's _request returns the same kinds of results as the sync one."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_url = f'http://127.0.0.1:{cls.server.server_address[1]}/api/v1'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.client = AsyncCrucibleClient(self.api_url, 'key')
+        self.sync = CrucibleClient(self.api_url, 'key')
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        self.sync.close()
+
+    async def test_json(self):
+        self.assertEqual(await self.client._request('get', '/json'), {'unique_id': 'ds1'})
+        self.assertEqual(self.sync._request('get', '/json'), {'unique_id': 'ds1'})
+
+    async def test_empty_body(self):
+        self.assertIsNone(await self.client._request('get', '/empty'))
+        self.assertIsNone(self.sync._request('get', '/empty'))
+
+    async def test_non_json_returns_response(self):
+        for endpoint in ('/text', '/broken-json'):
+            result = await self.client._request('get', endpoint)
+            self.assertIsInstance(result, httpx.Response)
+            self.assertEqual(result.content, RESPONSES['/api/v1' + endpoint][2])
+
+            result = self.sync._request('get', endpoint)
+            self.assertIsInstance(result, requests.Response)
+            self.assertEqual(result.content, RESPONSES['/api/v1' + endpoint][2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from pycrucible.cache import DiskCache, memoize
+from pycrucible.pycrucible import CrucibleClient
+
+
+class FakeClock:
+    """Stands in for time.monotonic / time.time, advanced by hand."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoize(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.clock = FakeClock()
+        patcher = mock.patch('pycrucible.cache.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def square(self, x):
+        self.calls.append(x)
+        return x * x
+
+    def test_results_are_cached(self):
+        cached = memoize(self.square)
+        self.assertEqual(cached(3), 9)
+        self.assertEqual(cached(3), 9)
+        self.assertEqual(cached(x=3), 9)
+        self.assertEqual(self.calls, [3, 3])
+
+    def test_ttl_expiry(self):
+        cached = memoize(self.square, ttl=10)
+        cached(2)
+        self.clock.now += 9
+        cached(2)
+        self.assertEqual(self.calls, [2])
+        self.clock.now += 2
+        cached(2)
+        self.assertEqual(self.calls, [2, 2])
+
+    def test_lru_eviction(self):
+        cached = memoize(self.square, maxsize=2)
+        cached(1)
+        cached(2)
+        cached(1)  # 1 is now the most recently used
+        cached(3)  # evicts 2
+        cached(1)
+        self.assertEqual(self.calls, [1, 2, 3])
+        cached(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+    def test_cache_clear(self):
+        cached = memoize(self.square)
+        cached(4)
+        cached.cache_clear()
+        cached(4)
+        self.assertEqual(self.calls, [4, 4])
+
+    def test_errors_are_not_cached_by_default(self):
+        def fail(x):
+            self.calls.append(x)
+            raise KeyError(x)
+        cached = memoize(fail, ttl=10)
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                cached(1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_error_caching_with_error_ttl(self):
+        def fail(x):
+            self.calls.append(x)
+            if x < 0:
+                raise KeyError(x)
+            raise ValueError(x)
+        cached = memoize(fail, ttl=100, cache_error=lambda err: isinstance(err, KeyError), error_ttl=5)
+
+        raised = []
+        for _ in range(3):
+            with self.assertRaises(KeyError) as context:
+                cached(-1)
+            raised.append(context.exception)
+        self.assertEqual(self.calls, [-1])
+        # every hit raises a copy of its own
+        self.assertIsNot(raised[1], raised[2])
+
+        # errors not selected by cache_error are raised each time
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cached(1)
+        self.assertEqual(self.calls, [-1, 1, 1])
+
+        # the cached error expires after error_ttl, well before ttl
+        self.clock.now += 6
+        with self.assertRaises(KeyError):
+            cached(-1)
+        self.assertEqual(self.calls, [-1, 1, 1, -1])
+
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f'{status_code} Error', response=response)
+
+
+class TestCachedNotFound(unittest.TestCase):
+
+    def setUp(self):
+        self.client = CrucibleClient('http://localhost:1/api/v1', 'key')
+        self.addCleanup(self.client.close)
+        self.requests = []
+
+    def serve(self, error):
+        def request(method, endpoint, **kwargs):
+            self.requests.append(endpoint)
+            raise error
+        self.client._request = request
+
+    def test_not_found_is_cached_and_raised_fresh(self):
+        self.serve(http_error(404))
+        raised = []
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.HTTPError) as context:
+                self.client.get_project('missing')
+            raised.append(context.exception)
+        self.assertEqual(self.requests, ['/projects/missing'])
+        self.assertEqual(len({id(err) for err in raised}), 3)
+        for err in raised:
+            self.assertIsInstance(err, requests.exceptions.HTTPError)
+            self.assertEqual(err.response.status_code, 404)
+        # a cached error does not drag along the tracebacks of earlier raises
+        self.assertEqual(_depth(raised[1].__traceback__), _depth(raised[2].__traceback__))
+
+    def test_not_found_is_forgotten_on_invalidate(self):
+        self.serve(http_error(404))
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client.get_project('missing')
+            self.client.invalidate_cache('get_project')
+        self.assertEqual(self.requests, ['/projects/missing'] * 2)
+
+    def test_other_errors_are_not_cached(self):
+        for error in (http_error(500), ValueError('not json'), requests.exceptions.ConnectionError()):
+            self.requests.clear()
+            self.serve(error)
+            for _ in range(2):
+                with self.assertRaises(type(error)):
+                    self.client.get_project('flaky')
+            self.assertEqual(self.requests, ['/projects/flaky'] * 2)
+
+
+def _depth(tb):
+    depth = 0
+    while tb is not None:
+        depth += 1
+        tb = tb.tb_next
+    return depth
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        self.cache = DiskCache(self.cache_dir)
+        self.clock = FakeClock()
+        patcher = mock.patch('pycrucible.cache.time.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.get('key', 'default'), 'default')
+        self.cache.set('key', {'a': [1, 2]}, ttl=60)
+        self.assertEqual(self.cache.get('key'), {'a': [1, 2]})
+        # shared with another instance on the same directory
+        self.assertEqual(DiskCache(self.cache_dir).get('key'), {'a': [1, 2]})
+
+    def test_expiry(self):
+        self.cache.set('key', 'value', ttl=60)
+        self.clock.now += 59
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.clock.now += 2
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_delete_and_clear(self):
+        self.cache.set('a', 1, ttl=60)
+        self.cache.set('b', 2, ttl=60)
+        self.cache.delete('a')
+        self.cache.delete('missing')
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), 2)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        self.cache.set('key', 'old', ttl=60)
+        with self.assertRaises(TypeError):
+            self.cache.set('key', object(), ttl=60)
+        self.assertFalse([name for name in os.listdir(self.cache_dir) if name.endswith('.tmp')])
+        self.assertEqual(self.cache.get('key'), 'old')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import gzip
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from urllib3.exceptions import ProtocolError
+
+from pycrucible.pycrucible import CrucibleClient
+
+PAYLOAD = os.urandom(200 * 1024)
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD at any path, dropping the connection halfway through
+    the body of the first `drops` responses.
+
+    With honor_range the server answers Range requests with 206 Partial
+    Content, otherwise it ignores them and sends the whole body again; with
+    gzip the body is sent gzip-encoded.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    drops = 0
+    honor_range = True
+    gzip = False
+    seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        range_header = self.headers.get('Range')
+        cls.seen.append(range_header)
+
+        body = gzip.compress(PAYLOAD) if cls.gzip else PAYLOAD
+        if range_header and cls.honor_range:
+            start = int(range_header.split('=')[1].rstrip('-'))
+            body = body[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{start + len(body) - 1}/{len(PAYLOAD)}')
+        else:
+            self.send_response(200)
+        if cls.gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if cls.drops > 0:
+            cls.drops -= 1
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class TestDownloadResume(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}/file.bin'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FlakyHandler.drops = 0
+        FlakyHandler.honor_range = True
+        FlakyHandler.gzip = False
+        FlakyHandler.seen = []
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = tmp.name
+        self.client = CrucibleClient('http://127.0.0.1:1/api/v1', 'key')
+        self.addCleanup(self.client.close)
+
+    def download(self):
+        return self.client._download_one('file.bin', self.url, self.output_dir, chunk_size=4096)
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_complete_download(self):
+        path = self.download()
+        self.assertEqual(self.read(path), PAYLOAD)
+        self.assertEqual(FlakyHandler.seen, [None])
+
+    def test_resumed_with_range(self):
+        FlakyHandler.drops = 1
+        path = self.download()
+        self.assertEqual(self.read(path), PAYLOAD)
+        self.assertEqual(len(FlakyHandler.seen), 2)
+        self.assertIsNone(FlakyHandler.seen[0])
+        start = int(FlakyHandler.seen[1].split('=')[1].rstrip('-'))
+        self.assertTrue(0 < start < len(PAYLOAD))
+
+    def test_range_ignored_restarts_from_zero(self):
+        FlakyHandler.drops = 1
+        FlakyHandler.honor_range = False
+        path = self.download()
+        self.assertEqual(self.read(path), PAYLOAD)
+        self.assertEqual(len(FlakyHandler.seen), 2)
+        self.assertIsNotNone(FlakyHandler.seen[1])
+
+    def test_encoded_body_is_not_resumed(self):
+        FlakyHandler.drops = 1
+        FlakyHandler.gzip = True
+        with self.assertRaises(ProtocolError):
+            self.download()
+        self.assertEqual(FlakyHandler.seen, [None])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'file.bin')))
+
+    def test_gives_up_after_repeated_drops(self):
+        FlakyHandler.drops = CrucibleClient._DOWNLOAD_RESUMES + 1
+        with self.assertRaises(ProtocolError):
+            self.download()
+        self.assertEqual(len(FlakyHandler.seen), CrucibleClient._DOWNLOAD_RESUMES + 1)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'file.bin')))
+
+
+if __name__ == '__main__':
+    unittest.main()